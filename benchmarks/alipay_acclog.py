@@ -0,0 +1,65 @@
+"""Time and peak memory of reading the table of a large Alipay ACCLOG export.
+
+Writes a gb18030 export with 1M rows, then reads the rows below the
+``-------收支明细列表-----`` marker by decoding every line of the file and
+with the memory-mapped marker search of ``alipay._iter_table_lines``::
+
+    python benchmarks/alipay_acclog.py
+"""
+
+import collections
+import csv
+import itertools
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from china_beancount_importers.alipay import _START, _iter_table_lines
+
+ROWS = 1_000_000
+HEADER = "时间,资金渠道,支出,收入,商品说明,备注,名称,账户余额（元）"
+
+
+def write_acclog(filepath: Path) -> None:
+    with open(filepath, "w", encoding="gb18030", newline="") as f:
+        f.write("支付宝账务明细查询\r\n账号:[20880000]\r\n")
+        f.write(f"{_START}\r\n{HEADER}\r\n")
+        f.writelines(
+            f"2023-08-30 20:46:41,余额,-{i % 9999 / 100:.2f},,商品 {i},,,1000.00\r\n"
+            for i in range(ROWS)
+        )
+
+
+def decode_all_lines(filepath: Path) -> csv.DictReader:
+    # the previous shape: every line decoded and kept in a list
+    with open(filepath, encoding="gb18030") as f:
+        lines = f.readlines()
+    table = itertools.dropwhile(lambda line: _START not in line, lines)
+    next(table, None)
+    return csv.DictReader(table)
+
+
+def measure(label: str, read) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    collections.deque(read(), maxlen=0)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed:6.2f}s  peak {peak / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / "2088_ACCLOG.csv"
+        write_acclog(filepath)
+        print(f"{ROWS:,} rows, {filepath.stat().st_size / 2**20:.0f} MiB")
+        measure("decode all lines", lambda: decode_all_lines(filepath))
+        measure(
+            "mmap marker search", lambda: csv.DictReader(_iter_table_lines(filepath))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Cost of parsing statement amounts, per value and per column.
+
+Parses 2M amount strings like ``1,234.56``, ``(12.00)`` and ``¥8.50`` with
+the replace-and-Decimal code the importers used to carry, with
+``amounts.parse_amount`` one at a time and with ``amounts.parse_amounts``
+over the whole column::
+
+    python benchmarks/amount_parsing.py
+"""
+
+import decimal
+import random
+import time
+
+from china_beancount_importers.amounts import parse_amount, parse_amounts
+
+N = 2_000_000
+
+
+def baseline(raw: str) -> decimal.Decimal:
+    cleaned = raw.replace("¥", "").replace(",", "").strip()
+    if cleaned.startswith("(") and cleaned.endswith(")"):
+        return -decimal.Decimal(cleaned[1:-1])
+    return decimal.Decimal(cleaned)
+
+
+def make_values(rng: random.Random, distinct: int) -> list[str]:
+    pool = []
+    for _ in range(distinct):
+        value = f"{rng.randrange(1, 10_000_000) / 100:,.2f}"
+        pool.append(rng.choice([value, f"({value})", f"¥{value}", f"-{value}"]))
+    return [rng.choice(pool) for _ in range(N)]
+
+
+def timed(label: str, run, values: list[str]) -> None:
+    start = time.perf_counter()
+    run(values)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:6.2f}s  {elapsed / N * 1e9:5.0f} ns/value")
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # a card statement repeats amounts a lot, a balance column hardly ever
+    for distinct in (2_000, N):
+        values = make_values(rng, distinct)
+        print(f"{N:,} values, {distinct:,} distinct")
+        timed("replace + Decimal", lambda v: list(map(baseline, v)), values)
+        timed("parse_amount", lambda v: list(map(parse_amount, v)), values)
+        timed("parse_amounts", parse_amounts, values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Parse time of CCB credit card statement emails.
+
+Writes emails with a growing number of detail rows nested in a layout
+table, then finds the billing period and the detail rows the previous way,
+with ``html.parser``, text of the whole document and per-table and per-row
+searches, and with ``CCBCreditEmlImporter`` on each tree builder::
+
+    python benchmarks/ccb_credit_eml.py
+"""
+
+import collections
+import tempfile
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from china_beancount_importers.ccb_credit_eml import (
+    CCBCreditEmlImporter,
+    _extract_billing_period,
+    iter_html_parts,
+)
+from china_beancount_importers.utils import read_email
+
+SIZES = (100, 1000, 3000)
+# layout tables around the detail table
+NESTING = 4
+
+
+def write_eml(filepath: Path, rows: int) -> None:
+    detail = "".join(
+        "<tr>"
+        + "".join(
+            f"<td>{text}</td>"
+            for text in (
+                "2024-01-10",
+                "2024-01-11",
+                "1234",
+                f"商户{i}",
+                "CNY",
+                f"{i % 999}.00",
+                "CNY",
+                f"{i % 999}.00",
+            )
+        )
+        + "</tr>"
+        for i in range(rows)
+    )
+    html = (
+        "<table><tr><td>" * NESTING
+        + "<table><tr><td>Statement Date 2024-02-05</td></tr>"
+        "<tr><td>2024年1月6日至2024年2月5日</td></tr></table>"
+        "<table><tr><td colspan='8'>【交易明细】</td></tr>"
+        + detail
+        + "</table>"
+        + "</td></tr></table>" * NESTING
+    )
+    msg = EmailMessage()
+    msg["Subject"] = "中国建设银行信用卡电子账单"
+    msg.set_content(f"<html><body>{html}</body></html>", subtype="html")
+    filepath.write_bytes(bytes(msg))
+
+
+def previous(filepath: Path) -> list[list[str]]:
+    # the previous shape of CCBCreditEmlImporter.extract
+    soup = BeautifulSoup(
+        "\n".join(iter_html_parts(read_email(filepath))), "html.parser"
+    )
+    _extract_billing_period(soup.get_text(" ", strip=True))
+    table = soup.find(
+        lambda a: (
+            a.name == "table"
+            and "【交易明细】" in a.get_text()
+            and a.find("table") is None
+        )
+    )
+    rows = table.find_all(lambda a: a.name == "tr" and len(a.select("td")) == 8)
+    return [[td.get_text(strip=True) for td in row.select("td")] for row in rows]
+
+
+def measure(label: str, extract, filepath: Path) -> None:
+    start = time.perf_counter()
+    collections.deque(extract(filepath), maxlen=0)
+    print(f"  {label:<24} {time.perf_counter() - start:6.2f}s")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in SIZES:
+            filepath = Path(tmp) / f"中国建设银行信用卡电子账单{rows}.eml"
+            write_eml(filepath, rows)
+            print(f"{rows:,} rows, {filepath.stat().st_size / 2**10:.0f} KiB")
+            measure("previous html.parser", previous, filepath)
+            for parser in ("html.parser", "lxml"):
+                importer = CCBCreditEmlImporter("Liabilities:CCB", parser=parser)
+                measure(f"indexed {parser}", importer.iter_extract, filepath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""``CCBDebitXlsImporter.extract`` on a generated 交易明细_*.xls.
+
+The .xls format holds at most 65,536 rows per sheet, so the generated export
+has 65,000 transactions. Decoding the rows (read included), per row as before
+or column by column, is timed separately from the full ``extract()``::
+
+    python benchmarks/ccb_debit_xls_extract.py
+"""
+
+import datetime
+import decimal
+import itertools
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pydantic
+import xlwt
+
+from china_beancount_importers.amounts import parse_amounts
+from china_beancount_importers.ccb_debit_txt import Row
+from china_beancount_importers.ccb_debit_xls import (
+    _COLUMNS,
+    CCBDebitXlsImporter,
+    _parse_column,
+    _read_columns,
+)
+from china_beancount_importers.dates import parse_yyyymmdd
+from china_beancount_importers.spreadsheet import iter_rows
+
+ROWS = 65_000
+row_decoder = pydantic.TypeAdapter(Row)
+
+
+def write_export(filepath: Path) -> None:
+    rng = random.Random(0)
+    wb = xlwt.Workbook(encoding="utf-8")
+    ws = wb.add_sheet("交易明细")
+    for r, text in enumerate(["中国建设银行账户交易明细", "账　　号：622280***3864"]):
+        ws.write(r, 0, text)
+    for c, name in enumerate(_COLUMNS):
+        ws.write(5, c, name)
+
+    day = datetime.date(2020, 1, 1)
+    balance = 100_000.0
+    for r in range(6, 6 + ROWS):
+        if rng.random() < 0.1:
+            day += datetime.timedelta(days=1)
+        amount = round(rng.uniform(1, 5000), 2)
+        expense = rng.random() < 0.7
+        balance += -amount if expense else amount
+        row = [
+            day.strftime("%Y%m%d"),
+            day.strftime("%Y%m%d"),
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+            f"{amount:,.2f}" if expense else "",
+            "" if expense else f"{amount:,.2f}",
+            f"{balance:,.2f}",
+            "人民币元",
+            rng.choice(["消费", "转账", "工资", "网上支付"]),
+            "6222************1234",
+            rng.choice(["某商户", "某人", ""]),
+            rng.choice(["北京", "上海", ""]),
+        ]
+        for c, value in enumerate(row):
+            ws.write(r, c, value)
+    ws.write(6 + ROWS, 0, "以上数据仅供参考")
+    wb.save(str(filepath))
+
+
+def decode_columns(filepath: Path) -> int:
+    columns = _read_columns(filepath)
+    dates = _parse_column(columns.tx_date, parse_yyyymmdd)
+    parse_amounts(columns.expense, default=decimal.Decimal(0))
+    parse_amounts(columns.income, default=decimal.Decimal(0))
+    return len(dates)
+
+
+def decode_per_row(filepath: Path) -> int:
+    # the previous shape: one dict, one pydantic validation and one Decimal
+    # per row
+    count = 0
+    for raw in itertools.islice(iter_rows(filepath), 6, None):
+        if not raw[0] or "以上数据" in raw[0]:
+            continue
+        row = row_decoder.validate_python(
+            dict(zip(_COLUMNS, map(str.strip, raw), strict=True))
+        )
+        expense = decimal.Decimal(row.expense.replace(",", "") or 0)
+        income = decimal.Decimal(row.income.replace(",", "") or 0)
+        _ = (row.parsed_date(), income if income > 0 else -expense)
+        count += 1
+    return count
+
+
+def main() -> None:
+    importer = CCBDebitXlsImporter("Assets:Bank:CCB")
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp, "交易明细_3864.xls")
+        write_export(filepath)
+
+        start = time.perf_counter()
+        list(iter_rows(filepath))
+        print(f"      read rows: {time.perf_counter() - start:.2f}s")
+
+        for name, decode in [("per-row", decode_per_row), ("columnar", decode_columns)]:
+            start = time.perf_counter()
+            count = decode(filepath)
+            print(
+                f"{name:>8} decode: {time.perf_counter() - start:.2f}s ({count} rows)"
+            )
+
+        start = time.perf_counter()
+        importer.extract(str(filepath), [])
+        print(f"      extract(): {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Row parsing cost of ``CCBXykmxPdfImporter``: per-row vs document scan.
+
+Synthetic rows with descriptions wrapped over several lines::
+
+    python benchmarks/ccb_xykmx_pdf_rows.py
+"""
+
+import timeit
+
+from china_beancount_importers.ccb_xykmx_pdf import CCBXykmxPdfImporter
+
+ROWS = 20_000
+WRAPPED = 8
+
+
+def make_lines() -> list[str]:
+    lines = []
+    for i in range(1, ROWS + 1):
+        lines.append(f"{i} 20240101 20240102 1234 财付通-美团外卖订单")
+        lines.extend(f"续行描述 {j}" for j in range(WRAPPED))
+        lines.append(f"人民币 元/{i}.00")
+    return lines
+
+
+def per_row(lines: list[str]) -> list:
+    rows = CCBXykmxPdfImporter._stitch_rows(lines)
+    return [CCBXykmxPdfImporter._parse_row(row) for row in rows]
+
+
+def main() -> None:
+    lines = make_lines()
+    assert per_row(lines) == CCBXykmxPdfImporter._scan_document(lines)
+
+    for name, fn in [
+        ("per-row", lambda: per_row(lines)),
+        ("document", lambda: CCBXykmxPdfImporter._scan_document(lines)),
+    ]:
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        print(f"{name:>9}: {best / ROWS * 1e6:.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
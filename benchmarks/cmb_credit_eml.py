@@ -0,0 +1,113 @@
+"""Parse time and peak memory per CMB credit card statement email.
+
+Writes emails with a growing number of transaction rows, then extracts
+them with a full BeautifulSoup tree and per-row css selection, and with
+``CmbEmlImporter`` parsing with lxml and walking the rows of ``#fixBand29``::
+
+    python benchmarks/cmb_credit_eml.py
+
+Each extraction runs in its own subprocess. Memory is the growth of the
+peak RSS over the extraction, which includes the tree libxml2 builds in C
+that tracemalloc cannot see.
+"""
+
+import collections
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from email.message import EmailMessage, Message
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from china_beancount_importers.cmb_credit_eml import CmbEmlImporter
+from china_beancount_importers.utils import read_email
+
+SIZES = (100, 1000, 3000)
+
+
+def band(i: int) -> str:
+    cells = "".join(
+        f"<td>{text}</td>"
+        for text in ("", "0105", "0106", f"商户{i}-描述{i}", f"￥&nbsp;{i % 999}.00")
+    )
+    return (
+        "<tr><td><div id='fixBand15'><table><tr><td>"
+        f"<table><tr>{cells}</tr></table>"
+        "</td></tr></table></div></td></tr>"
+    )
+
+
+def write_eml(filepath: Path, rows: int) -> None:
+    html = (
+        "<html><body>"
+        "<div id='fixBand2'><table><tr><td>账单周期 "
+        "<span>2024/01/01-2024/01/31</span></td></tr></table></div>"
+        "<div id='fixBand29'><div id='loopBand2'><table><tbody>"
+        + "".join(band(i) for i in range(rows))
+        + "</tbody></table></div></div></body></html>"
+    )
+    msg = EmailMessage()
+    msg["Subject"] = "招商银行信用卡电子账单"
+    msg.set_content("plain")
+    msg.make_mixed()
+    msg.get_payload()[0].set_content(html, subtype="html")
+    filepath.write_bytes(bytes(msg))
+
+
+def full_tree(filepath: Path) -> list[list[str]]:
+    # the previous shape: the whole statement as a soup, selected per row
+    payload = read_email(filepath).get_payload()[0]
+    assert isinstance(payload, Message)
+    d = BeautifulSoup(payload.get_payload(decode=True).decode("utf-8"), "lxml")
+    rows = []
+    for band in d.select("#fixBand29 #loopBand2>table>tbody>tr"):
+        tds = band.select("td #fixBand15 table table td")
+        if tds:
+            rows.append([td.text for td in tds])
+    return rows
+
+
+VARIANTS = {
+    "full soup tree": full_tree,
+    "lxml region walk": CmbEmlImporter("Liabilities:CMB").iter_extract,
+}
+
+
+def max_rss() -> int:
+    """Peak RSS of this process in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run(label: str, filepath: Path) -> None:
+    # in the subprocess: everything is imported, only the extraction grows
+    # the peak RSS
+    before = max_rss()
+    start = time.perf_counter()
+    collections.deque(VARIANTS[label](filepath), maxlen=0)
+    elapsed = time.perf_counter() - start
+    growth = max_rss() - before
+    print(f"  {label:<20} {elapsed:6.2f}s  peak RSS +{growth / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in SIZES:
+            filepath = Path(tmp) / f"招商银行信用卡电子账单{rows}.eml"
+            write_eml(filepath, rows)
+            print(f"{rows:,} rows, {filepath.stat().st_size / 2**10:.0f} KiB")
+            for label in VARIANTS:
+                subprocess.run(
+                    [sys.executable, __file__, label, str(filepath)], check=True
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run(sys.argv[1], Path(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,59 @@
+"""Per-line cost of ``CMBCreditPdfImporter.parse_lines``.
+
+Compares the compiled line grammar with the token based parser it falls back
+to, on synthetic statement lines::
+
+    python benchmarks/cmb_credit_pdf_rows.py
+"""
+
+import random
+import timeit
+
+from china_beancount_importers.cmb_credit_pdf import (
+    NON_TXN_PATTERNS,
+    TABLE_HEADER,
+    CMBCreditPdfImporter,
+)
+
+N = 20_000
+
+
+def make_lines(n: int) -> list[str]:
+    rng = random.Random(0)
+    lines = [TABLE_HEADER, "消费"]
+    for i in range(n):
+        if i % 50 == 0:
+            lines.append("Description RMB Amount")
+        lines.append(
+            f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d} "
+            f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d} "
+            f"财付通-美团 订单{i} {rng.uniform(1, 999):.2f} 1234 "
+            f"{rng.uniform(1, 999):.2f}"
+        )
+    return lines
+
+
+def parse_tokens(importer: CMBCreditPdfImporter, lines: list[str]) -> list:
+    # the pre-grammar loop: eight separate non-transaction patterns, then tokens
+    rows = []
+    for text in lines[2:]:
+        if any(p.match(text) for p in NON_TXN_PATTERNS):
+            continue
+        rows.append(importer._parse_row_tokens(text, year=2024, month=1, section=None))
+    return rows
+
+
+def main() -> None:
+    importer = CMBCreditPdfImporter("Liabilities:CreditCard:CMB")
+    lines = make_lines(N)
+
+    for name, fn in [
+        ("tokens", lambda: parse_tokens(importer, lines)),
+        ("grammar", lambda: list(importer.parse_lines(lines, year=2024, month=1))),
+    ]:
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        print(f"{name:>8}: {best / len(lines) * 1e6:.2f} us/line")
+
+
+if __name__ == "__main__":
+    main()
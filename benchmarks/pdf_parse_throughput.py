@@ -0,0 +1,107 @@
+"""Throughput of the PDF importers' parse stages, without any PDF.
+
+Synthetic statement lines are recorded with ``pdf.dump_pages`` and replayed
+with ``pdf.load_lines``, then timed through ``parse_lines`` and
+``build_entries``. Lines recorded from a real statement with
+``python -m china_beancount_importers.pdf statement.pdf lines.txt`` replay
+the same way::
+
+    python benchmarks/pdf_parse_throughput.py [--lines 100000]
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from china_beancount_importers import pdf
+from china_beancount_importers.ccb_credit_pdf import CCBCreditPdfImporter
+from china_beancount_importers.ccb_xykmx_pdf import CCBXykmxPdfImporter
+from china_beancount_importers.cmb_credit_pdf import TABLE_HEADER, CMBCreditPdfImporter
+
+PAGE_LINES = 40
+
+
+def cmb_lines(n: int) -> Iterator[str]:
+    yield TABLE_HEADER
+    yield "消费"
+    for i in range(n):
+        yield f"01/{i % 28 + 1:02d} 01/{i % 28 + 1:02d} 财付通-美团 订单{i} 32.50 1234 32.50"
+    yield "本期还款总额"
+
+
+def ccb_lines(n: int) -> Iterator[str]:
+    yield "交易日 银行记账日 卡号后四位 交易描述 交易币/金额 结算币/金额"
+    for i in range(n):
+        day = i % 28 + 1
+        yield f"2024-01-{day:02d} 2024-01-{day:02d} 5678 支付宝-超市{i} CNY 45.60 CNY 45.60"
+    yield "*** 结束 The End ***"
+
+
+def xykmx_lines(n: int) -> Iterator[str]:
+    for i in range(1, n // 2 + 1):
+        yield f"{i} 20240102 20240103 5678 财付通-一个很长的"
+        yield "商户名称 人民币 元/-12.50"
+
+
+def paginate(lines: Iterator[str]) -> Iterator[list[str]]:
+    page: list[str] = []
+    for line in lines:
+        page.append(line)
+        if len(page) == PAGE_LINES:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    account = "Liabilities:CreditCard"
+    period = {"year": 2024, "month": 1}
+    # name, importer, lines, parse_lines() and build_entries() keywords
+    cases: list[tuple[str, Any, Iterator[str], dict[str, int], dict[str, int]]] = [
+        ("cmb", CMBCreditPdfImporter(account), cmb_lines(args.lines), period, period),
+        ("ccb", CCBCreditPdfImporter(account), ccb_lines(args.lines), {}, period),
+        ("xykmx", CCBXykmxPdfImporter(account), xykmx_lines(args.lines), {}, {}),
+        (
+            "xykmx-doc",
+            CCBXykmxPdfImporter(account, document_scan=True),
+            xykmx_lines(args.lines),
+            {},
+            {},
+        ),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, importer, lines, parse_kw, build_kw in cases:
+            recorded = Path(tmp, f"{name}.txt")
+            pdf.dump_pages(recorded, paginate(lines))
+            replayed = pdf.load_lines(recorded)
+
+            records, parse_s = timed(
+                lambda: list(importer.parse_lines(replayed, **parse_kw))  # noqa: B023
+            )
+            entries, build_s = timed(
+                importer.build_entries, records, str(recorded), **build_kw
+            )
+            print(
+                f"{name:>9}: {len(replayed)} lines, {len(entries)} entries, "
+                f"parse {len(replayed) / parse_s:,.0f} lines/s, "
+                f"build {len(entries) / build_s:,.0f} entries/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
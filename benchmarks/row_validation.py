@@ -0,0 +1,91 @@
+"""Per-row versus batch pydantic validation of the csv row decoders.
+
+Validates 100k rows with a ``TypeAdapter(Row)`` once per row, with
+``rows_decoder.validate_python`` once for the whole list and with
+``utils.validate_rows`` once per chunk of ``_CHUNK_ROWS`` rows::
+
+    python benchmarks/row_validation.py
+"""
+
+import timeit
+
+import pydantic
+
+from china_beancount_importers import ccb_debit_txt, cmb_debeit
+from china_beancount_importers.utils import validate_rows
+
+N = 100_000
+
+CASES = [
+    (
+        "cmb_debeit",
+        cmb_debeit,
+        {
+            "交易日期": "20260225",
+            "交易时间": "20:00:00",
+            "收入": "",
+            "支出": "10.00",
+            "余额": "90.00",
+            "交易类型": "消费",
+            "交易备注": "午饭",
+        },
+    ),
+    (
+        "ccb_debit_txt",
+        ccb_debit_txt,
+        {
+            "记账日": "20240102",
+            "交易日期": "20240101",
+            "交易时间": "12:00:00",
+            "支出": "10.00",
+            "收入": "",
+            "账户余额": "100.00",
+            "币种": "CNY",
+            "摘要": "午餐",
+            "对方账号": "6222",
+            "对方户名": "某商户",
+            "交易地点": "北京",
+        },
+    ),
+]
+
+
+def main() -> None:
+    for name, module, row in CASES:
+        rows = [dict(row) for _ in range(N)]
+        decoder = pydantic.TypeAdapter(module.Row)
+        per_row = min(
+            timeit.repeat(
+                lambda: [decoder.validate_python(r) for r in rows],  # noqa: B023
+                number=1,
+                repeat=3,
+            )
+        )
+        batch = min(
+            timeit.repeat(
+                lambda: module.rows_decoder.validate_python(rows),  # noqa: B023
+                number=1,
+                repeat=3,
+            )
+        )
+        chunked = min(
+            timeit.repeat(
+                lambda: list(
+                    validate_rows(
+                        module.rows_decoder,  # noqa: B023
+                        rows,  # noqa: B023
+                        chunk_size=module._CHUNK_ROWS,  # noqa: B023
+                    )
+                ),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(
+            f"{name:>13}: per-row {per_row:.3f}s, batch {batch:.3f}s, "
+            f"chunked {chunked:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Per-row cost of parsing statement timestamps and dates.
+
+Parses 1M ``YYYY-MM-DD HH:MM:SS`` timestamps spread over a year with
+``strptime(...).astimezone(tz)`` and with ``dates.parse_local_datetime``,
+then 1M ``YYYYMMDD`` dates by slicing and with ``dates.parse_yyyymmdd``::
+
+    python benchmarks/timestamp_parsing.py
+"""
+
+import datetime
+import random
+import time
+import zoneinfo
+
+from china_beancount_importers import dates
+
+N = 1_000_000
+
+TZ = zoneinfo.ZoneInfo("Asia/Shanghai")
+
+
+def baseline_time(s: str) -> datetime.datetime:
+    return datetime.datetime.strptime(s, "%Y-%m-%d %H:%M:%S").astimezone(TZ)
+
+
+def baseline_date(s: str) -> datetime.date:
+    return datetime.date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+
+
+def timed(label: str, parse, values: list[str]) -> None:
+    start = time.perf_counter()
+    for value in values:
+        parse(value)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:6.2f}s  {elapsed / len(values) * 1e9:6.0f} ns/row")
+
+
+def main() -> None:
+    rng = random.Random(0)
+    start = datetime.datetime(2023, 1, 1)
+    moments = sorted(
+        start + datetime.timedelta(seconds=rng.randrange(365 * 86400)) for _ in range(N)
+    )
+    stamps = [m.strftime("%Y-%m-%d %H:%M:%S") for m in moments]
+    days = [m.strftime("%Y%m%d") for m in moments]
+
+    timed("strptime + astimezone(tz)", baseline_time, stamps)
+    timed(
+        "dates.parse_local_datetime(tz)",
+        lambda s: dates.parse_local_datetime(s, TZ),
+        stamps,
+    )
+    timed(
+        "strptime + astimezone()",
+        lambda s: datetime.datetime.strptime(s, "%Y-%m-%d %H:%M:%S").astimezone(),
+        stamps,
+    )
+    timed("dates.parse_local_datetime()", dates.parse_local_datetime, stamps)
+    timed("slice YYYYMMDD", baseline_date, days)
+    timed("dates.parse_yyyymmdd", dates.parse_yyyymmdd, days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Reading a generated multi-year WeChat xlsx export.
+
+Compares the pandas reader the importer used to have (``pd.read_excel`` and
+a dict per row) with the rows it streams now, and times the full
+``extract()``::
+
+    python benchmarks/wechat_xlsx.py
+"""
+
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+from china_beancount_importers.wechat import (
+    _TABLE_SEPARATOR,
+    WechatImporter,
+    _iter_xlsx_rows,
+)
+
+ROWS = 30_000  # about three years of daily spending
+HEADER = [
+    "交易时间",
+    "交易类型",
+    "交易对方",
+    "商品",
+    "收/支",
+    "金额(元)",
+    "支付方式",
+    "当前状态",
+    "交易单号",
+    "商户单号",
+    "备注",
+]
+
+
+def write_export(filepath: Path) -> None:
+    rng = random.Random(0)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for _ in range(16):
+        ws.append(["微信支付账单明细"])
+    ws.append([_TABLE_SEPARATOR])
+    ws.append(HEADER)
+    t = datetime.datetime(2025, 1, 1)
+    for i in range(ROWS):
+        t -= datetime.timedelta(minutes=rng.randint(1, 90))
+        ws.append(
+            [
+                t.strftime("%Y-%m-%d %H:%M:%S"),
+                "商户消费",
+                rng.choice(["某商户", "某超市", "某餐厅"]),
+                rng.choice(["午餐", "/", "日用品"]),
+                rng.choice(["支出", "收入"]),
+                f"¥{rng.uniform(1, 500):.2f}",
+                rng.choice(["零钱", "招商银行(1111)"]),
+                "支付成功",
+                f"{4200000000 + i}",
+                "/",
+                "/",
+            ]
+        )
+    wb.save(str(filepath))
+
+
+def read_with_pandas(filepath: Path) -> list[dict[str, str]]:
+    df = pd.read_excel(filepath, dtype=str, header=None).fillna("")
+    header_idx = None
+    for i, row in enumerate(df.values):
+        if _TABLE_SEPARATOR in str(row[0]):
+            header_idx = i + 1
+            break
+    if header_idx is None:
+        return []
+    header = df.values[header_idx]
+    return [
+        dict(zip(header, line, strict=True)) for line in df.values[header_idx + 1 :]
+    ]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp, "微信支付账单流水文件(20220101-20241231)_1.xlsx")
+        write_export(filepath)
+
+        for name, read in [
+            ("pandas", read_with_pandas),
+            ("rows", lambda p: list(_iter_xlsx_rows(str(p)))),
+        ]:
+            start = time.perf_counter()
+            read(filepath)
+            print(f"{name:>9}: {time.perf_counter() - start:.2f}s read")
+
+        importer = WechatImporter("Assets:WeChat")
+        start = time.perf_counter()
+        entries = importer.extract(str(filepath))
+        elapsed = time.perf_counter() - start
+        print(f"extract(): {elapsed:.2f}s, {len(entries)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,23 @@
+import codecs
 import csv
 import datetime
 import fnmatch
+import io
+import itertools
+import mmap
+import os
 import zoneinfo
+from collections.abc import Iterator
 from pathlib import Path
 
 from beancount.core import data, flags
 from beancount.core.amount import Amount
-from beancount.core.number import D
+from beancount.core.number import ZERO
 from beangulp.importer import Importer
 
+from .amounts import parse_amount
+from .dates import parse_local_datetime
+from .encoding import sniff_encoding
 from .utils import make_posting, make_transaction
 
 _START = "-------收支明细列表-----"
@@ -20,7 +29,38 @@ tz = zoneinfo.ZoneInfo("Asia/Shanghai")
 
 def parse_time(s: str) -> datetime.datetime:
     """parse date time from string '2023-08-30 20:46:41'"""
-    return datetime.datetime.strptime(s, "%Y-%m-%d %H:%M:%S").astimezone(tz)
+    return parse_local_datetime(s, tz)
+
+
+def _iter_table_lines(filepath: str) -> Iterator[str]:
+    """Yield the decoded lines after the ``_START`` marker line.
+
+    The file is memory-mapped and the encoded marker found with a byte
+    search, only the part after it is decoded, incrementally as it is read.
+    """
+    encoding = sniff_encoding(filepath, default="gb18030")
+    codec = codecs.lookup(encoding).name
+    if codec == "utf-16":
+        # not ASCII compatible, no byte search for the marker
+        with open(filepath, encoding=encoding) as f:
+            lines = itertools.dropwhile(lambda line: _START not in line, f)
+            next(lines, None)  # the marker line itself
+            yield from lines
+        return
+
+    marker = _START.encode("utf-8" if codec == "utf-8-sig" else encoding)
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = mm.find(marker)
+            end_of_marker_line = mm.find(b"\n", found) if found >= 0 else -1
+        if end_of_marker_line < 0:
+            return
+
+        f.seek(end_of_marker_line + 1)
+        with io.TextIOWrapper(f, encoding=encoding) as table:
+            yield from table
 
 
 class AlipayImporter(Importer):
@@ -42,23 +82,17 @@ class AlipayImporter(Importer):
         return fnmatch.fnmatch(fn, "*_ACCLOG.csv")
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        entries: data.Entries = []
-
-        lines: list[str] = []
-        with open(filepath, encoding="gb18030") as f:
-            start = False
-            for line in f:
-                if _START in line:
-                    start = True
-                    continue
-                if start:
-                    lines.append(line)
-
-        reader = csv.DictReader(lines)
-        rows = list(reader)
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield directives row by row, in file order.
+
+        The first row of each day with a balance is preceded by a
+        ``Balance`` for the following day.
+        """
         day_balance: dict[datetime.date, str] = {}
 
-        for i, row in enumerate(rows):
+        for i, row in enumerate(csv.DictReader(_iter_table_lines(filepath))):
             flag = flags.FLAG_WARNING
             dt = parse_time(row["时间"])
             account_1_text = row["资金渠道"]
@@ -72,7 +106,9 @@ class AlipayImporter(Importer):
                     "row": row_data,
                 },
             )
-            amount = Amount(D(row["支出"] or row["收入"]), self.currency)
+            amount = Amount(
+                parse_amount(row["支出"] or row["收入"], default=ZERO), self.currency
+            )
             payee: str = row.get("商品说明") or row["备注"] or row["名称"]
             payee = payee.removeprefix(_COMMENTS_STR)
             if payee == "/":
@@ -89,15 +125,13 @@ class AlipayImporter(Importer):
                 and account_1 == self._account
             ):
                 day_balance[dt.date()] = balance_raw
-                entries.append(
-                    data.Balance(
-                        meta=data.new_metadata(filepath, i, kvlist={"row": row_data}),
-                        date=dt.date() + datetime.timedelta(days=1),
-                        account=account_1,
-                        amount=Amount(D(balance_raw), self.currency),
-                        tolerance=None,
-                        diff_amount=None,
-                    )
+                yield data.Balance(
+                    meta=data.new_metadata(filepath, i, kvlist={"row": row_data}),
+                    date=dt.date() + datetime.timedelta(days=1),
+                    account=account_1,
+                    amount=Amount(parse_amount(balance_raw), self.currency),
+                    tolerance=None,
+                    diff_amount=None,
                 )
 
             txn = make_transaction(
@@ -110,5 +144,4 @@ class AlipayImporter(Importer):
                 data.EMPTY_SET,
                 postings,
             )
-            entries.append(txn)
-        return entries
+            yield txn
@@ -0,0 +1,78 @@
+"""Amount parsing shared by the importers.
+
+Statement amounts come as ``1,234.56``, ``(1,234.56)`` for negatives,
+``¥1.00`` or ``人民币元/32.50``. Thousands separators and currency signs
+are dropped and surrounding blanks, no-break spaces included, stripped before
+the text goes to ``Decimal``.
+"""
+
+from __future__ import annotations
+
+import decimal
+from collections.abc import Iterable
+
+# joins a column to clean it in one go, never part of an amount
+_SEPARATOR = "\0"
+
+
+def _drop_signs(text: str) -> str:
+    """Drop thousands separators and currency signs."""
+    if "," in text:
+        text = text.replace(",", "")
+    if not text.isascii():
+        text = text.replace("¥", "").replace("￥", "")
+    return text
+
+
+def _parse_cleaned(cleaned: str, raw: str) -> decimal.Decimal:
+    if "/" in cleaned:
+        # a currency prefix like "人民币元/"
+        cleaned = cleaned.rpartition("/")[2]
+    negative = cleaned[:1] == "(" and cleaned[-1:] == ")"
+    if negative:
+        cleaned = cleaned[1:-1]
+    try:
+        value = decimal.Decimal(cleaned)
+    except decimal.InvalidOperation:
+        raise ValueError(f"cannot parse amount from {raw!r}") from None
+    return -value if negative else value
+
+
+def parse_amount(
+    raw: str, *, default: decimal.Decimal | None = None
+) -> decimal.Decimal:
+    """Parse an amount like ``'1,234.56'``, ``'(1,234.56)'`` or ``'¥1.00'``.
+
+    ``default`` is returned for an empty or blank ``raw``, which is an error
+    without it.
+    """
+    cleaned = _drop_signs(raw).strip()
+    if not cleaned and default is not None:
+        return default
+    return _parse_cleaned(cleaned, raw)
+
+
+def parse_amounts(
+    values: Iterable[str], *, default: decimal.Decimal | None = None
+) -> list[decimal.Decimal]:
+    """:func:`parse_amount` over a column of values.
+
+    The distinct values are cleaned together as one joined string, then each
+    is parsed once.
+    """
+    values = list(values)
+    distinct = list(dict.fromkeys(values))
+    joined = _SEPARATOR.join(distinct)
+    if joined.count(_SEPARATOR) != len(distinct) - 1:
+        # a value contains the separator, clean them one by one
+        cleaned = list(map(_drop_signs, distinct))
+    else:
+        cleaned = _drop_signs(joined).split(_SEPARATOR)
+
+    parsed = {
+        raw: (
+            default if not text and default is not None else _parse_cleaned(text, raw)
+        )
+        for raw, text in zip(distinct, map(str.strip, cleaned), strict=True)
+    }
+    return list(map(parsed.__getitem__, values))
@@ -1,17 +1,21 @@
 import dataclasses
 import datetime
 import decimal
+import itertools
 import re
+from collections.abc import Iterable, Iterator
 from datetime import date
 from fnmatch import fnmatch
 from pathlib import Path
 
-import pdfplumber
 from beancount import Amount
 from beancount.core import data
 from beangulp import extract
 from beangulp.importer import Importer
 
+from .amounts import parse_amount
+from .dates import parse_yyyymmdd
+from .pdf import PdfBackend, PdfLineCache, get_backend, iter_lines
 from .utils import make_posting, make_transaction
 
 DATE_TOKEN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
@@ -36,11 +40,13 @@ class Record:
     raw_line: str
 
 
-def _parse_amount_token(raw: str) -> decimal.Decimal:
-    cleaned = raw.replace(",", "").strip()
-    if cleaned.startswith("(") and cleaned.endswith(")"):
-        return -decimal.Decimal(cleaned[1:-1])
-    return decimal.Decimal(cleaned)
+def statement_period(filepath: str) -> tuple[int, int]:
+    """The statement year and month, from the file name."""
+    match = re.search(r"ccb-credit-(\d{4})-?(\d{2})", Path(filepath).name)
+    if match is None:
+        raise ValueError(f"cannot infer year-month from filepath: {filepath!r}")
+    year, month = match.groups()
+    return int(year), int(month)
 
 
 class CCBCreditPdfImporter(Importer):
@@ -50,10 +56,16 @@ class CCBCreditPdfImporter(Importer):
         currency: str = "CNY",
         *,
         currency_map: dict[str, str] | None = None,
+        backend: str | PdfBackend = "pdfplumber",
+        line_cache: PdfLineCache | None = None,
+        workers: int | None = None,
     ) -> None:
         self._account: str = account
         self._currency: str = currency
         self._currency_map: dict[str, str] = currency_map or {"CNY": "CNY"}
+        self._backend: PdfBackend = get_backend(backend)
+        self._line_cache: PdfLineCache | None = line_cache
+        self._workers: int | None = workers
 
     def account(self, filepath: str) -> data.Account:
         return self._account
@@ -125,22 +137,37 @@ class CCBCreditPdfImporter(Importer):
             card_last4=last4,
             description=description,
             trans_currency=trans_currency,
-            trans_amount=_parse_amount_token(trans_amount),
+            trans_amount=parse_amount(trans_amount),
             settlement_currency=settlement_currency,
-            settlement_amount=_parse_amount_token(settlement_amount),
+            settlement_amount=parse_amount(settlement_amount),
             raw_line=text,
         )
 
-    def _extract_records(self, lines: list[str]) -> list[Record]:
-        for i, text in enumerate(lines):
+    def iter_lines(self, filepath: str) -> Iterator[str]:
+        """Yield the statement text lines, lazily, up to the end of the table."""
+        return iter_lines(
+            filepath,
+            backend=self._backend,
+            cache=self._line_cache,
+            workers=self._workers,
+        )
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[Record]:
+        """Parse the transaction table out of the statement text lines.
+
+        Both the current and the legacy table layout are recognized by their
+        header line. Records are yielded as their lines are read.
+        """
+        it = iter(lines)
+        for text in it:
             if self._is_legacy_header_line(text):
-                return self._extract_records_legacy(lines[i + 1 :])
+                yield from self._extract_records_legacy(it)
+                return
             if self._is_header_line(text):
-                return self._extract_records_new(lines[i:])
-        return []
+                yield from self._extract_records_new(itertools.chain([text], it))
+                return
 
-    def _extract_records_new(self, lines: list[str]) -> list[Record]:
-        records: list[Record] = []
+    def _extract_records_new(self, lines: Iterable[str]) -> Iterator[Record]:
         in_table = False
 
         for text in lines:
@@ -152,7 +179,7 @@ class CCBCreditPdfImporter(Importer):
                 continue
 
             if self._should_stop(text):
-                break
+                return
 
             if self._should_skip(text):
                 continue
@@ -160,23 +187,24 @@ class CCBCreditPdfImporter(Importer):
             record = self._parse_record_line(text)
             if record is None:
                 continue
-            records.append(record)
-
-        return records
+            yield record
 
-    def _extract_records_legacy(self, lines: list[str]) -> list[Record]:
-        records: list[Record] = []
+    def _extract_records_legacy(self, lines: Iterable[str]) -> Iterator[Record]:
         pending_prefix: list[str] = []
-        i = 0
+        it = iter(lines)
+        line = next(it, None)
 
-        while i < len(lines):
-            if lines[i].startswith("人民币账户"):
-                i += 1
+        while line is not None:
+            # one line of lookahead, a description may continue on it
+            following = next(it, None)
+
+            if line.startswith("人民币账户"):
+                line = following
                 continue
 
-            m = _LEGACY_DATA_LINE_RE.match(lines[i])
+            m = _LEGACY_DATA_LINE_RE.match(line)
             if m:
-                data_line = lines[i]
+                data_line = line
                 groups = m.groups()
                 trade_text, booking_text, card_last4 = groups[0], groups[1], groups[2]
                 trans_currency, trans_amount = groups[3], groups[4]
@@ -189,11 +217,11 @@ class CCBCreditPdfImporter(Importer):
                     # Description continues on the single line right after the
                     # data line (or spans the pending prefix lines).
                     suffix = ""
-                    if i + 1 < len(lines) and not _LEGACY_DATA_LINE_RE.match(
-                        lines[i + 1]
+                    if following is not None and not _LEGACY_DATA_LINE_RE.match(
+                        following
                     ):
-                        suffix = lines[i + 1]
-                        i += 1  # skip suffix line
+                        suffix = following
+                        following = next(it, None)  # skip suffix line
 
                     description = "".join(pending_prefix) + suffix
 
@@ -201,52 +229,43 @@ class CCBCreditPdfImporter(Importer):
                 pending_prefix = []
 
                 if description:
-                    records.append(
-                        Record(
-                            trade_date=datetime.date(
-                                int(trade_text[:4]),
-                                int(trade_text[4:6]),
-                                int(trade_text[6:8]),
-                            ),
-                            booking_date=datetime.date(
-                                int(booking_text[:4]),
-                                int(booking_text[4:6]),
-                                int(booking_text[6:8]),
-                            ),
-                            card_last4=card_last4,
-                            description=description,
-                            trans_currency=trans_currency,
-                            trans_amount=_parse_amount_token(trans_amount),
-                            settlement_currency=settlement_currency,
-                            settlement_amount=_parse_amount_token(settlement_amount),
-                            raw_line=data_line,
-                        )
+                    yield Record(
+                        trade_date=parse_yyyymmdd(trade_text),
+                        booking_date=parse_yyyymmdd(booking_text),
+                        card_last4=card_last4,
+                        description=description,
+                        trans_currency=trans_currency,
+                        trans_amount=parse_amount(trans_amount),
+                        settlement_currency=settlement_currency,
+                        settlement_amount=parse_amount(settlement_amount),
+                        raw_line=data_line,
                     )
             else:
-                pending_prefix.append(lines[i])
-
-            i += 1
+                pending_prefix.append(line)
 
-        return records
+            line = following
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        results: list[data.Directive] = []
-
-        lines: list[str] = []
-        with pdfplumber.open(filepath) as pdf:
-            filename = Path(filepath).name
-            match = re.search(r"ccb-credit-(\d{4})-?(\d{2})", filename)
-            if match is None:
-                raise ValueError(f"cannot infer year-month from filepath: {filepath!r}")
-            year, month = match.groups()
-            period_tag = f"credit-ccb-{int(year):04d}-{int(month):02d}"
-            for page in pdf.pages:
-                for line in page.extract_text_lines():
-                    text = (line.get("text") or "").strip()
-                    if text:
-                        lines.append(text)
-
-        records = self._extract_records(lines)
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per statement row, in statement order."""
+        year, month = statement_period(filepath)
+        # lazy, pages after "*** 结束" are never laid out
+        records = self.parse_lines(self.iter_lines(filepath))
+        yield from self.iter_entries(records, filepath, year=year, month=month)
+
+    def build_entries(
+        self, records: Iterable[Record], filepath: str, *, year: int, month: int
+    ) -> data.Entries:
+        """Turn parsed records into transactions, ``filepath`` goes to the metadata."""
+        return list(self.iter_entries(records, filepath, year=year, month=month))
+
+    def iter_entries(
+        self, records: Iterable[Record], filepath: str, *, year: int, month: int
+    ) -> Iterator[data.Directive]:
+        """Like :meth:`build_entries`, one transaction at a time."""
+        period_tag = f"credit-ccb-{year:04d}-{month:02d}"
 
         for i, record in enumerate(records):
             row_data = {
@@ -291,17 +310,13 @@ class CCBCreditPdfImporter(Importer):
 
             tags = frozenset({period_tag})
 
-            results.append(
-                make_transaction(
-                    meta,
-                    record.trade_date,
-                    "*",
-                    record.description,
-                    None,
-                    tags,
-                    data.EMPTY_SET,
-                    postings,
-                )
+            yield make_transaction(
+                meta,
+                record.trade_date,
+                "*",
+                record.description,
+                None,
+                tags,
+                data.EMPTY_SET,
+                postings,
             )
-
-        return results
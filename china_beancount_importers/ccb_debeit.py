@@ -1,31 +1,35 @@
 import dataclasses
 import datetime
 import fnmatch
-from decimal import Decimal
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Annotated
 
-import pandas as pd
 import pydantic
 from beancount import Amount
 from beancount.core import data
 from beangulp import extract
 from beangulp.importer import Importer
 
+from .amounts import parse_amount, parse_amounts
+from .dates import parse_yyyymmdd
+from .spreadsheet import read_table
 from .utils import make_posting, make_transaction
 
+_HEADER_ROW = 3  # 0-based; the column headers, transactions follow
+
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
-class Row:
-    date: Annotated[str, pydantic.Field(alias="交易日期")]
-    amount: Annotated[str, pydantic.Field(alias="交易金额")]
-    summary: Annotated[str, pydantic.Field(alias="摘要")]
-    balance: Annotated[str, pydantic.Field(alias="账户余额")]
-    description: Annotated[str, pydantic.Field(alias="交易地点/附言")]
-    posting: Annotated[str, pydantic.Field(alias="对方账号与户名")]
+class Columns:
+    date: Annotated[list[str], pydantic.Field(alias="交易日期")]
+    amount: Annotated[list[str], pydantic.Field(alias="交易金额")]
+    summary: Annotated[list[str], pydantic.Field(alias="摘要")]
+    balance: Annotated[list[str], pydantic.Field(alias="账户余额")]
+    description: Annotated[list[str], pydantic.Field(alias="交易地点/附言")]
+    posting: Annotated[list[str], pydantic.Field(alias="对方账号与户名")]
 
 
-decoder = pydantic.TypeAdapter(Row)
+columns_decoder = pydantic.TypeAdapter(Columns)
 
 
 class CCBDebeitImporter(Importer):
@@ -54,62 +58,57 @@ class CCBDebeitImporter(Importer):
         )
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        account = self._account
-
-        results: list[data.Directive] = []
-
-        day_balance: dict[datetime.date, str] = {}
-
-        df = pd.read_excel(filepath, dtype=str).fillna("")
+        return list(self.iter_extract(filepath))
 
-        header: list[str] = df.values[2]
-        rows: list[dict[str, str]] = [
-            {key: value for key, value in zip(header, row, strict=True)}
-            for row in df.values[3:]
-        ]
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield directives oldest row first, the reverse of the file order.
 
-        for i, item in reversed(list(enumerate(rows))):
-            row_data = dict(item)
-            row = decoder.validate_python(item)
-
-            meta = data.new_metadata(filepath, i, kvlist={"row": row_data})
+        The last row of each day is preceded by a ``Balance`` for the
+        following day, the balance after that row.
+        """
+        account = self._account
 
-            amount = Amount(Decimal(row.amount.replace(",", "")), self._currency)
+        header, rows = read_table(filepath, header_row=_HEADER_ROW)
+        columns = columns_decoder.validate_python(
+            dict(zip(header, map(list, zip(*rows, strict=True)), strict=True))
+            if rows
+            else {key: [] for key in header}
+        )
 
-            date = datetime.date(
-                year=int(row.date[:4]),
-                month=int(row.date[4:6]),
-                day=int(row.date[6:8]),
+        amounts = parse_amounts(columns.amount)
+        dates = list(map(parse_yyyymmdd, columns.date))
+        # Rows are newest first, the balance at the end of a day is that of
+        # its first row in the file, the last assignment per date wins.
+        day_end = {date: i for i, date in reversed(list(enumerate(dates)))}
+        balances = {i: parse_amount(columns.balance[i]) for i in day_end.values()}
+
+        for i in reversed(range(len(rows))):
+            date = dates[i]
+            meta = data.new_metadata(
+                filepath, i, kvlist={"row": dict(zip(header, rows[i], strict=True))}
             )
 
-            if date not in day_balance:
-                day_balance[date] = row.balance
-                results.append(
-                    data.Balance(
-                        meta=meta,
-                        date=date + datetime.timedelta(days=1),
-                        account=account,
-                        amount=Amount(Decimal(row.balance.replace(",", "")), "CNY"),
-                        tolerance=None,
-                        diff_amount=None,
-                    )
+            if i in balances:
+                yield data.Balance(
+                    meta=meta,
+                    date=date + datetime.timedelta(days=1),
+                    account=account,
+                    amount=Amount(balances[i], "CNY"),
+                    tolerance=None,
+                    diff_amount=None,
                 )
 
             postings = [
-                make_posting(account=account, units=amount),
+                make_posting(account=account, units=Amount(amounts[i], self._currency)),
             ]
 
-            results.append(
-                make_transaction(
-                    meta,
-                    date,
-                    "*",
-                    row.description,
-                    None,
-                    data.EMPTY_SET,
-                    data.EMPTY_SET,
-                    postings,
-                )
+            yield make_transaction(
+                meta,
+                date,
+                "*",
+                columns.description[i],
+                None,
+                data.EMPTY_SET,
+                data.EMPTY_SET,
+                postings,
             )
-
-        return results
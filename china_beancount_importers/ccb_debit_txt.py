@@ -1,6 +1,8 @@
 import csv
 import dataclasses
 import datetime
+import itertools
+from collections.abc import Iterator
 from decimal import Decimal
 from pathlib import Path
 from typing import Annotated
@@ -10,7 +12,10 @@ from beancount import Amount
 from beancount.core import data
 from beangulp.importer import Importer
 
-from .utils import make_posting, make_transaction
+from .amounts import parse_amount
+from .dates import parse_yyyymmdd
+from .memo import HeaderProbe, probe_header
+from .utils import make_posting, make_transaction, validate_rows
 
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
@@ -28,11 +33,23 @@ class Row:
     location: Annotated[str, pydantic.Field(alias="交易地点")]
 
     def parsed_date(self) -> datetime.date:
-        s = self.tx_date
-        return datetime.date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+        return parse_yyyymmdd(self.tx_date)
 
 
-decoder = pydantic.TypeAdapter(Row)
+# validates a chunk of rows per call, errors are located by row index
+rows_decoder = pydantic.TypeAdapter(list[Row])
+_CHUNK_ROWS = 1024
+
+
+def _probe(filepath: str | Path) -> HeaderProbe:
+    # 3 metadata lines and the column header row
+    return probe_header(
+        filepath,
+        "ccb-debit-txt",
+        lines=4,
+        encoding="utf-8",
+        parse_suffix=CCBDebitTxtImporter._extract_suffix_from_header,
+    )
 
 
 class CCBDebitTxtImporter(Importer):
@@ -61,88 +78,88 @@ class CCBDebitTxtImporter(Importer):
             return False
 
         try:
-            with open(path, encoding="utf-8") as f:
-                lines = [f.readline() for _ in range(4)]
-        except OSError:
+            probe = _probe(path)
+        except (OSError, ValueError):  # unreadable, or not text we can decode
             return False
 
         # Line 4 should be the column header row containing "记账日"
-        if "记账日" not in lines[3]:
+        if len(probe.lines) < 4 or "记账日" not in probe.lines[3]:
             return False
-        suffix = self._extract_suffix_from_header(lines)
+        suffix = probe.account_suffix
         return suffix is not None and suffix in self._account_map
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        path = Path(filepath)
-        with open(path, encoding="utf-8") as f:
-            # Skip 3 metadata header lines
-            header_lines = [f.readline() for _ in range(3)]
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-        suffix = self._extract_suffix_from_header(header_lines)
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per row in file order, then a ``Balance``
+        for the day after the last row.
+        """
+        probe = _probe(filepath)
+        suffix = probe.account_suffix
         if suffix is None:
             raise ValueError(f"cannot extract account suffix from {filepath!r}")
         if suffix not in self._account_map:
             raise ValueError(f"account suffix {suffix!r} not in account_map")
         account = self._account_map[suffix]
 
-        parsed = [decoder.validate_python(row) for row in rows]
-
-        results: list[data.Directive] = []
-
-        for lineno, row in enumerate(parsed, start=5):
-            expense = self._parse_decimal(row.expense) if row.expense else Decimal(0)
-            income = self._parse_decimal(row.income) if row.income else Decimal(0)
-
-            if income > 0:
-                amt = income
-            else:
-                amt = -expense
-
-            narration = row.location if row.location else row.summary
-
-            meta = data.new_metadata(filepath, lineno)
-            if row.tx_time:
-                meta["time"] = row.tx_time
-            meta["raw_summary"] = row.summary
-
-            postings = [
-                make_posting(
-                    account=account,
-                    units=Amount(amt, self._currency),
-                )
-            ]
-
-            results.append(
-                make_transaction(
+        with open(filepath, encoding=probe.encoding) as f:
+            # Skip 3 metadata header lines
+            reader = csv.DictReader(itertools.islice(f, 3, None))
+            rows = validate_rows(rows_decoder, reader, chunk_size=_CHUNK_ROWS)
+
+            # rows are validated and yielded a chunk at a time
+            last: Row | None = None
+            lineno = 4
+            for lineno, (_, row) in enumerate(rows, start=5):
+                last = row
+                expense = parse_amount(row.expense, default=Decimal(0))
+                income = parse_amount(row.income, default=Decimal(0))
+
+                if income > 0:
+                    amt = income
+                else:
+                    amt = -expense
+
+                narration = row.location if row.location else row.summary
+
+                meta = data.new_metadata(filepath, lineno)
+                if row.tx_time:
+                    meta["time"] = row.tx_time
+                meta["raw_summary"] = row.summary
+
+                postings = [
+                    make_posting(
+                        account=account,
+                        units=Amount(amt, self._currency),
+                    )
+                ]
+
+                yield make_transaction(
                     meta,
                     row.parsed_date(),
                     payee=row.counterpart_name or None,
                     narration=narration,
                     postings=postings,
                 )
-            )
+
+        if last is None:
+            return
 
         # Emit a balance assertion dated the day after the last transaction
-        last = parsed[-1]
         balance_date = last.parsed_date() + datetime.timedelta(days=1)
-        balance_val = self._parse_decimal(last.balance)
-
-        balance_meta = data.new_metadata(filepath, len(parsed) + 5)
-        results.append(
-            data.Balance(
-                meta=balance_meta,
-                date=balance_date,
-                account=account,
-                amount=Amount(balance_val, self._currency),
-                tolerance=None,
-                diff_amount=None,
-            )
+        balance_val = parse_amount(last.balance)
+
+        balance_meta = data.new_metadata(filepath, lineno + 1)
+        yield data.Balance(
+            meta=balance_meta,
+            date=balance_date,
+            account=account,
+            amount=Amount(balance_val, self._currency),
+            tolerance=None,
+            diff_amount=None,
         )
 
-        return results
-
     @staticmethod
     def _extract_suffix_from_header(lines: list[str]) -> str | None:
         """Extract the last 4 digits of the account number from the header."""
@@ -159,13 +176,6 @@ class CCBDebitTxtImporter(Importer):
     @staticmethod
     def _account_suffix(path: Path) -> str | None:
         try:
-            with open(path, encoding="utf-8") as f:
-                lines = [f.readline() for _ in range(4)]
-            return CCBDebitTxtImporter._extract_suffix_from_header(lines)
-        except OSError:
+            return _probe(path).account_suffix
+        except (OSError, ValueError):
             return None
-
-    @staticmethod
-    def _parse_decimal(value: str) -> Decimal:
-        raw = value.strip().replace(",", "")
-        return Decimal(raw)
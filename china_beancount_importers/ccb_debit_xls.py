@@ -1,16 +1,23 @@
+import dataclasses
 import datetime
 import decimal
+import itertools
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import Annotated, TypeVar
 
-import pandas as pd
+import pydantic
 from beancount import Amount
 from beancount.core import data
 from beangulp.importer import Importer
 
-from .ccb_debit_txt import Row, decoder
+from .amounts import parse_amount, parse_amounts
+from .dates import parse_yyyymmdd
+from .memo import memoized
+from .spreadsheet import iter_rows, rows_size
 from .utils import make_posting, make_transaction
 
-# 建行借记卡 xls 与 txt 导出的列结构一致，共用 ccb_debit_txt.Row 做解析
+# 建行借记卡 xls 与 txt 导出的列结构一致（见 ccb_debit_txt.Row），这里按列解析
 _HEADER_ROW = 6  # 1-based; the 6th row holds the column headers
 _COLUMNS = [
     "记账日",
@@ -26,6 +33,61 @@ _COLUMNS = [
     "交易地点",
 ]
 
+T = TypeVar("T")
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class Columns:
+    booking_date: Annotated[list[str], pydantic.Field(alias="记账日")]
+    tx_date: Annotated[list[str], pydantic.Field(alias="交易日期")]
+    tx_time: Annotated[list[str], pydantic.Field(alias="交易时间")]
+    expense: Annotated[list[str], pydantic.Field(alias="支出")]
+    income: Annotated[list[str], pydantic.Field(alias="收入")]
+    balance: Annotated[list[str], pydantic.Field(alias="账户余额")]
+    currency: Annotated[list[str], pydantic.Field(alias="币种")]
+    summary: Annotated[list[str], pydantic.Field(alias="摘要")]
+    counterpart_account: Annotated[list[str], pydantic.Field(alias="对方账号")]
+    counterpart_name: Annotated[list[str], pydantic.Field(alias="对方户名")]
+    location: Annotated[list[str], pydantic.Field(alias="交易地点")]
+
+
+columns_decoder = pydantic.TypeAdapter(Columns)
+
+
+def _read_rows(filepath: str | Path) -> list[list[str]]:
+    """Every row of the sheet, read at most once per run.
+
+    calamine parses the whole sheet even when only the header rows are
+    needed, so identify() and extract() share the rows.
+    """
+    return memoized(
+        filepath, "ccb-debit-xls", lambda: list(iter_rows(filepath)), size=rows_size
+    )
+
+
+def _read_columns(filepath: str | Path) -> Columns:
+    """Read the transaction rows column by column, stripped, footer dropped."""
+    body = _read_rows(filepath)[_HEADER_ROW:]
+    columns = list(zip(*body, strict=True)) or [()] * len(_COLUMNS)
+    if len(columns) != len(_COLUMNS):
+        raise ValueError(
+            f"expected {len(_COLUMNS)} columns, found {len(columns)} in {filepath!r}"
+        )
+
+    # Drop footer rows ("以上数据...") and rows without a booking date
+    keep = [bool(value) and "以上数据" not in value for value in columns[0]]
+    cleaned = [
+        list(map(str.strip, itertools.compress(column, keep))) for column in columns
+    ]
+    return columns_decoder.validate_python(dict(zip(_COLUMNS, cleaned, strict=True)))
+
+
+def _parse_column(values: Iterable[str], parse: Callable[[str], T]) -> list[T]:
+    """Parse a column, each distinct value once."""
+    values = list(values)
+    parsed = {value: parse(value) for value in set(values)}
+    return list(map(parsed.__getitem__, values))
+
 
 class CCBDebitXlsImporter(Importer):
     """Importer for CCB debit card xls exports (交易明细_*.xls)."""
@@ -45,52 +107,52 @@ class CCBDebitXlsImporter(Importer):
             return False
 
         try:
-            df = pd.read_excel(path, header=None, nrows=6, dtype=str)
             # Row 5 should contain the column headers
-            row5 = df.iloc[5].tolist()
-            return any("记账日" in str(v) for v in row5 if pd.notna(v))
+            head = _read_rows(path)[:_HEADER_ROW]
+            return len(head) == _HEADER_ROW and any("记账日" in v for v in head[-1])
         except Exception:  # noqa: BLE001 - any read failure means "not our file"
             return False
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        df = pd.read_excel(filepath, header=None, skiprows=_HEADER_ROW, dtype=str)
-        df.columns = _COLUMNS
-
-        # Drop footer rows
-        df = df[df["记账日"].notna() & ~df["记账日"].str.contains("以上数据", na=False)]
-        df = df.reset_index(drop=True)
-
-        rows: list[Row] = [
-            decoder.validate_python(
-                {
-                    col: "" if pd.isna(value) else str(value).strip()
-                    for col, value in row.items()
-                }
-            )
-            for _, row in df.iterrows()
-        ]
-
-        results: list[data.Directive] = []
-
-        for lineno, row in enumerate(rows, start=_HEADER_ROW + 1):
-            expense = (
-                self._parse_decimal(row.expense) if row.expense else decimal.Decimal(0)
-            )
-            income = (
-                self._parse_decimal(row.income) if row.income else decimal.Decimal(0)
-            )
-
-            if income > 0:
-                amt = income
-            else:
-                amt = -expense
-
-            narration = row.location if row.location else row.summary
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per row in file order, then a ``Balance``
+        for the day after the last row.
+        """
+        columns = _read_columns(filepath)
+
+        dates = _parse_column(columns.tx_date, parse_yyyymmdd)
+        expenses = parse_amounts(columns.expense, default=decimal.Decimal(0))
+        incomes = parse_amounts(columns.income, default=decimal.Decimal(0))
+
+        for lineno, (
+            date,
+            expense,
+            income,
+            tx_time,
+            summary,
+            name,
+            location,
+        ) in enumerate(
+            zip(
+                dates,
+                expenses,
+                incomes,
+                columns.tx_time,
+                columns.summary,
+                columns.counterpart_name,
+                columns.location,
+                strict=True,
+            ),
+            start=_HEADER_ROW + 1,
+        ):
+            amt = income if income > 0 else -expense
 
             meta = data.new_metadata(filepath, lineno)
-            if row.tx_time:
-                meta["time"] = row.tx_time
-            meta["raw_summary"] = row.summary
+            if tx_time:
+                meta["time"] = tx_time
+            meta["raw_summary"] = summary
 
             postings = [
                 make_posting(
@@ -99,36 +161,25 @@ class CCBDebitXlsImporter(Importer):
                 )
             ]
 
-            results.append(
-                make_transaction(
-                    meta,
-                    row.parsed_date(),
-                    payee=row.counterpart_name or None,
-                    narration=narration,
-                    postings=postings,
-                )
+            yield make_transaction(
+                meta,
+                date,
+                payee=name or None,
+                narration=location if location else summary,
+                postings=postings,
             )
 
-        # Emit a balance assertion dated the day after the last transaction
-        last = rows[-1]
-        balance_date = last.parsed_date() + datetime.timedelta(days=1)
-        balance_val = self._parse_decimal(last.balance)
-
-        balance_meta = data.new_metadata(filepath, len(rows) + _HEADER_ROW + 1)
-        results.append(
-            data.Balance(
-                meta=balance_meta,
-                date=balance_date,
-                account=self._account,
-                amount=Amount(balance_val, self._currency),
-                tolerance=None,
-                diff_amount=None,
-            )
+        # Emit a balance assertion dated the day after the last transaction,
+        # only the last balance is ever needed
+        balance_date = dates[-1] + datetime.timedelta(days=1)
+        balance_val = parse_amount(columns.balance[-1])
+
+        balance_meta = data.new_metadata(filepath, len(dates) + _HEADER_ROW + 1)
+        yield data.Balance(
+            meta=balance_meta,
+            date=balance_date,
+            account=self._account,
+            amount=Amount(balance_val, self._currency),
+            tolerance=None,
+            diff_amount=None,
         )
-
-        return results
-
-    @staticmethod
-    def _parse_decimal(value: str) -> decimal.Decimal:
-        raw = value.strip().replace(",", "")
-        return decimal.Decimal(raw)
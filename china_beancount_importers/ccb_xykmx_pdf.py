@@ -2,18 +2,50 @@ import dataclasses
 import datetime
 import decimal
 import re
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
-import pdfplumber
 from beancount import Amount
 from beancount.core import data
 from beangulp.importer import Importer
 
+from .amounts import parse_amount
+from .dates import parse_yyyymmdd
+from .pdf import (
+    PdfBackend,
+    PdfLineCache,
+    get_backend,
+    iter_lines,
+    iter_pages,
+    sniff_pdf,
+)
 from .utils import make_posting, make_transaction
 
 _ROW_START_RE = re.compile(r"^\d+\s+\d{8}\s+\d{8}\s+\d{4}\s+")
 _ROW_RE = re.compile(r"^(\d+)\s+(\d{8})\s+(\d{8})\s+(\d{4})\s+(.+)$")
 _AMOUNT_RE = re.compile(r"人民币\s*元/\s*([+-]?\d[\d,]*\.\d{2})")
+_HEADER_PREFIXES = (
+    "生成时间:",
+    "Credit Card Transaction Details",
+    "客户姓名（Name）：",
+    "序号 交易日",
+    "No. T-Date",
+)
+# One row of the newline joined document: the row start line followed by its
+# continuation lines, up to the next row start. The description runs up to the
+# first amount, which can only begin at a "人"; a row without an amount still
+# matches so rows keep their numbering.
+_ROW_START = r"\d+[^\S\n]+\d{8}[^\S\n]+\d{8}[^\S\n]+\d{4}[^\S\n]"
+_ROW_REST = rf"[^\n]*(?:\n(?!{_ROW_START})[^\n]*)*"
+_DOCUMENT_ROW_RE = re.compile(
+    r"^\d+[^\S\n]+(?P<trade>\d{8})[^\S\n]+(?P<booking>\d{8})"
+    r"[^\S\n]+(?P<last4>\d{4})[^\S\n]+"
+    rf"(?:(?P<description>[^\n人]*(?:(?:人|\n(?!{_ROW_START}))[^\n人]*)*?)"
+    r"人民币\s*元/\s*(?P<amount>[+-]?\d[\d,]*\.\d{2})"
+    rf"{_ROW_REST}|{_ROW_REST})",
+    re.MULTILINE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
@@ -33,9 +65,22 @@ class CCBXykmxPdfImporter(Importer):
         1 20240101 20240102 1234 商户名... 人民币 元/-123.45
     """
 
-    def __init__(self, account: str, currency: str = "CNY") -> None:
+    def __init__(
+        self,
+        account: str,
+        currency: str = "CNY",
+        *,
+        backend: str | PdfBackend = "pdfplumber",
+        line_cache: PdfLineCache | None = None,
+        workers: int | None = None,
+        document_scan: bool = False,
+    ) -> None:
         self._account: str = account
         self._currency: str = currency
+        self._backend: PdfBackend = get_backend(backend)
+        self._line_cache: PdfLineCache | None = line_cache
+        self._workers: int | None = workers
+        self._document_scan: bool = document_scan
 
     def account(self, filepath: str) -> data.Account:
         return self._account
@@ -48,22 +93,68 @@ class CCBXykmxPdfImporter(Importer):
             return False
 
         try:
-            with pdfplumber.open(path) as pdf:
-                first_page = pdf.pages[0]
-                for line in first_page.extract_text_lines():
-                    text = (line.get("text") or "").strip()
-                    if "信用卡交易明细" in text:
-                        return True
+            # the statement title is usually in the document information
+            # dictionary, which is found without laying out any page
+            sniffed = sniff_pdf(path, "信用卡交易明细")
+        except OSError:
+            return False
+        if sniffed is not None:
+            return sniffed
+
+        try:
+            # only the first page is laid out, extract() reuses it
+            pages = iter_pages(path, backend=self._backend, cache=self._line_cache)
+            first_page = next(pages, [])
+            pages.close()
         except Exception:  # noqa: BLE001 - any parse failure means "not our file"
             return False
 
-        return False
+        return any("信用卡交易明细" in text for text in first_page)
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        results: list[data.Directive] = []
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per table row, in statement order."""
+        records = self.parse_lines(self.iter_lines(filepath))
+        yield from self.iter_entries(records, filepath)
+
+    def iter_lines(self, filepath: str) -> Iterator[str]:
+        """Yield the text lines of the statement, lazily."""
+        return iter_lines(
+            filepath,
+            backend=self._backend,
+            cache=self._line_cache,
+            workers=self._workers,
+        )
+
+    def parse_lines(self, lines: Iterable[str]) -> list[Record | None]:
+        """Parse the table rows out of the statement text lines.
 
-        for lineno, row in enumerate(self._extract_rows(Path(filepath)), start=1):
-            record = self._parse_row(row)
+        Returns one entry per table row, ``None`` for rows without a
+        description or amount, so that row numbers survive as line numbers.
+        """
+        lines = (
+            text
+            for text in lines
+            if "信用卡交易明细" not in text and not text.startswith(_HEADER_PREFIXES)
+        )
+        if self._document_scan:
+            return self._scan_document(lines)
+        return [self._parse_row(row) for row in self._stitch_rows(lines)]
+
+    def build_entries(
+        self, records: Iterable[Record | None], filepath: str
+    ) -> data.Entries:
+        """Turn parsed rows into transactions, ``filepath`` goes to the metadata."""
+        return list(self.iter_entries(records, filepath))
+
+    def iter_entries(
+        self, records: Iterable[Record | None], filepath: str
+    ) -> Iterator[data.Directive]:
+        """Like :meth:`build_entries`, one transaction at a time."""
+
+        for lineno, record in enumerate(records, start=1):
             if record is None:
                 continue
 
@@ -79,52 +170,62 @@ class CCBXykmxPdfImporter(Importer):
                 )
             ]
 
-            results.append(
-                make_transaction(
-                    meta,
-                    record.trade_date,
-                    narration=record.description,
-                    postings=postings,
-                )
+            yield make_transaction(
+                meta,
+                record.trade_date,
+                narration=record.description,
+                postings=postings,
             )
 
-        return results
-
     @staticmethod
-    def _extract_rows(path: Path) -> list[str]:
+    def _stitch_rows(lines: Iterable[str]) -> list[str]:
         rows: list[str] = []
-        current: str | None = None
-
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                for raw_line in page.extract_text_lines():
-                    text = (raw_line.get("text") or "").strip()
-                    if not text:
-                        continue
-
-                    if "信用卡交易明细" in text or text.startswith(
-                        (
-                            "生成时间:",
-                            "Credit Card Transaction Details",
-                            "客户姓名（Name）：",
-                            "序号 交易日",
-                            "No. T-Date",
-                        )
-                    ):
-                        continue
-
-                    if _ROW_START_RE.match(text):
-                        if current:
-                            rows.append(current)
-                        current = text
-                    elif current is not None:
-                        current = f"{current} {text}"
+        current: list[str] = []
+
+        for text in lines:
+            if _ROW_START_RE.match(text):
+                if current:
+                    rows.append(" ".join(current))
+                current = [text]
+            elif current:
+                current.append(text)
 
         if current:
-            rows.append(current)
+            rows.append(" ".join(current))
 
         return rows
 
+    @staticmethod
+    def _scan_document(lines: Iterable[str]) -> list[Record | None]:
+        """Parse all rows with one pass over the newline joined lines.
+
+        Gives the same result as ``_parse_row`` over ``_stitch_rows``, one
+        entry per row, ``None`` for rows without a description or amount.
+        """
+        document = "\n".join(lines)
+        records: list[Record | None] = []
+
+        for m in _DOCUMENT_ROW_RE.finditer(document):
+            amount = m["amount"]
+            description = _WHITESPACE_RE.sub(" ", m["description"] or "").strip()
+            if amount is None or not description:
+                records.append(None)
+                continue
+
+            trade_text = m["trade"]
+            booking_text = m["booking"]
+            records.append(
+                Record(
+                    trade_date=parse_yyyymmdd(trade_text),
+                    booking_date=parse_yyyymmdd(booking_text),
+                    card_last4=m["last4"],
+                    description=description,
+                    amount=parse_amount(amount),
+                )
+            )
+
+        return records
+
     @staticmethod
     def _parse_row(row: str) -> Record | None:
         row = re.sub(r"\s+", " ", row).strip()
@@ -142,17 +243,9 @@ class CCBXykmxPdfImporter(Importer):
             return None
 
         return Record(
-            trade_date=datetime.date(
-                int(trade_text[:4]), int(trade_text[4:6]), int(trade_text[6:8])
-            ),
-            booking_date=datetime.date(
-                int(booking_text[:4]), int(booking_text[4:6]), int(booking_text[6:8])
-            ),
+            trade_date=parse_yyyymmdd(trade_text),
+            booking_date=parse_yyyymmdd(booking_text),
             card_last4=card_last4,
             description=description,
-            amount=CCBXykmxPdfImporter._parse_decimal(amount_match.group(1)),
+            amount=parse_amount(amount_match.group(1)),
         )
-
-    @staticmethod
-    def _parse_decimal(value: str) -> decimal.Decimal:
-        return decimal.Decimal(value.replace(",", ""))
@@ -1,17 +1,33 @@
 import datetime
 import re
-from email import parser, policy
+from collections.abc import Iterator
 from email.message import Message
 from os import path
 
+import lxml.html
 from beancount.core import data, flags
 from beancount.core.amount import Amount
-from beancount.core.number import D
 from beangulp.importer import Importer
-from bs4 import BeautifulSoup
 from dateutil.parser import parse as dateparse
+from lxml import etree
 
-from .utils import cast_checked, make_posting, make_transaction
+from .amounts import parse_amount
+from .utils import cast_checked, make_posting, make_transaction, read_email
+
+_DATE_RANGE_RE = re.compile(r"\d{4}\/\d{1,2}\/\d{1,2}-\d{4}\/\d{1,2}\/\d{1,2}")
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+# the rows of the transaction region, then the cells of one row, the same
+# elements as the css selectors "#fixBand29 #loopBand2>table>tbody>tr" and
+# "td #fixBand15 table table td"
+_BANDS = etree.XPath("//*[@id='fixBand29']//*[@id='loopBand2']/table/tbody/tr")
+_BAND_CELLS = etree.XPath(".//td//*[@id='fixBand15']//table//table//td")
+# text nodes only, attributes and comments are not searched for the period
+_TEXT_NODES = etree.XPath("//text()")
+
+
+def _find_date_range(tree: etree._Element) -> str:
+    """The first text node holding the statement period."""
+    return next(str(node) for node in _TEXT_NODES(tree) if _DATE_RANGE_RE.search(node))
 
 
 class CmbEmlImporter(Importer):
@@ -31,41 +47,41 @@ class CmbEmlImporter(Importer):
         return self.account_name
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        entries: data.Entries = []
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per statement row, in statement order."""
         index = 0
 
-        with open(filepath, "rb") as f:
-            eml = parser.BytesParser(policy=policy.default).parse(fp=f)
+        eml = read_email(filepath)
 
-        b = cast_checked(
+        raw = cast_checked(
             bytes,
             cast_checked(Message, cast_checked(list, eml.get_payload())[0]).get_payload(
                 decode=True
             ),
-        ).decode("utf-8")
-
-        d = BeautifulSoup(b, "lxml")
-        date_range = cast_checked(
-            str,
-            d.find(
-                string=re.compile(r"\d{4}\/\d{1,2}\/\d{1,2}-\d{4}\/\d{1,2}\/\d{1,2}")
-            ),
         )
 
+        # libxml2 parses the whole document, the region cannot be told apart
+        # before parsing. Only the rows found in #fixBand29 and their cells
+        # become python objects.
+        tree = lxml.html.document_fromstring(raw, parser=_HTML_PARSER)
+
+        date_range = _find_date_range(tree)
+
         transaction_date = dateparse(date_range.split("-")[1].split("(")[0]).date()
 
-        bands = d.select("#fixBand29 #loopBand2>table>tbody>tr")
-        for band in bands:
-            tds = band.select("td #fixBand15 table table td")
+        for band in _BANDS(tree):
+            tds = [td.text_content() for td in _BAND_CELLS(band)]
             if len(tds) == 0:
                 continue
 
-            full_descriptions = tds[3].text.strip().split("-")
+            full_descriptions = tds[3].strip().split("-")
             payee = full_descriptions[0]
 
-            trade_date = tds[1].text.strip()
+            trade_date = tds[1].strip()
             if trade_date == "" or payee == "消费分期":
-                trade_date = tds[2].text.strip()
+                trade_date = tds[2].strip()
 
             date = datetime.date(
                 transaction_date.year, int(trade_date[:2]), int(trade_date[2:])
@@ -73,15 +89,9 @@ class CmbEmlImporter(Importer):
 
             narration = "-".join(full_descriptions[1:])
             real_currency = "CNY"
-            real_price = (
-                tds[4]
-                .text.replace("￥", "")
-                .replace("\xa0", "")
-                .replace("¥", "")
-                .strip()
-            )
+            real_price = parse_amount(tds[4])
 
-            amount = -Amount(D(real_price), real_currency)
+            amount = -Amount(real_price, real_currency)
             row_data = {
                 "trade_date_raw": trade_date,
                 "transaction_date": transaction_date.isoformat(),
@@ -89,7 +99,7 @@ class CmbEmlImporter(Importer):
                 "payee": payee,
                 "narration": narration,
                 "currency": real_currency,
-                "amount": real_price,
+                "amount": str(real_price),
             }
             meta = data.new_metadata(filepath, index, kvlist={"row": row_data})
             txn = make_transaction(
@@ -103,6 +113,4 @@ class CmbEmlImporter(Importer):
                 [make_posting(self.account_name, amount)],
             )
 
-            entries.append(txn)
-
-        return entries
+            yield txn
@@ -1,17 +1,20 @@
 import dataclasses
 import datetime
 import decimal
+import functools
 import re
+from collections.abc import Iterable, Iterator
 from datetime import date
 from pathlib import Path
 from typing import Any
 
-import pdfplumber
 from beancount import Amount
 from beancount.core import data
 from beangulp import extract
 from beangulp.importer import Importer
 
+from .amounts import parse_amount
+from .pdf import PdfBackend, PdfLineCache, get_backend, iter_lines
 from .utils import make_posting, make_transaction
 
 DATE_TOKEN = re.compile(r"^\d{2}/\d{2}$")
@@ -21,6 +24,11 @@ AMOUNT_TOKEN_WITH_CURRENCY = re.compile(
 )
 LAST4_TOKEN = re.compile(r"^\d{4}$")
 SECTION_MARKERS = {"消费", "分期", "退款", "还款"}
+TABLE_HEADER = "交易日 记账日 交易摘要"
+# the lines ending the table, pages are cropped below them
+TABLE_FOOTER = ("本期还款总额", "本期应还金额", "Current Balance", "New Balance")
+# Page titles and the English lines of the column header. ``iter_lines``
+# crops the titles away, lines recorded without the crop still have them.
 NON_TXN_PATTERNS = [
     re.compile(r"招商银行信用卡对账单（个人消费卡账户 \d{4}年\d{2}月）"),
     re.compile(r"CMB Credit Card Statement \(\d{4}\.\d{2}\)"),
@@ -33,6 +41,20 @@ NON_TXN_PATTERNS = [
         r"SOLD POSTED DESCRIPTION RMB AMOUNT CARD NO\(Last 4digits\) Original Tran Amount"
     ),
 ]
+NON_TXN_LINE = re.compile("|".join(f"(?:{p.pattern})" for p in NON_TXN_PATTERNS))
+# A canonical transaction line: single-space separated tokens, the booking date
+# is taken whenever the second token is a date, like the token based parser in
+# ``_parse_row_tokens`` does. Anything else goes through that parser, which
+# either handles it or raises the detailed error.
+TXN_LINE = re.compile(
+    r"(?P<trade>\d{2})/(?P<trade_day>\d{2})"
+    r"(?: (?P<book>\d{2})/(?P<book_day>\d{2}))?"
+    r" (?(book)|(?!\d{2}/\d{2}(?: |\Z)))"
+    r"(?P<summary>\S+(?: \S+)*?)"
+    r" (?P<amount>\(?[+-]?\d[\d,]*(?:\.\d+)?\)?)"
+    r" (?P<last4>\d{4})"
+    r" (?P<orig>\(?[+-]?\d[\d,]*(?:\.\d+)?\)?(?:\([A-Za-z]{2,4}\))?)\Z"
+)
 
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
@@ -66,6 +88,11 @@ def normalize_currency(raw: str, mapping: dict[str, str]) -> str:
 
 def extract_amount(raw: str) -> decimal.Decimal:
     """parse '人民币元/32.50'"""
+    try:
+        return parse_amount(raw)
+    except ValueError:
+        pass
+    # a number with text around it, or an unbalanced parenthesis
     cleaned = raw.split("/")[-1].replace(",", "").strip()
     match = re.search(r"[-+]?\d+(?:\.\d+)?", cleaned)
     if match is None:
@@ -76,6 +103,15 @@ def extract_amount(raw: str) -> decimal.Decimal:
     return amount
 
 
+def statement_period(filepath: str) -> tuple[int, int]:
+    """The statement year and month, from the file name."""
+    match = re.search(r".*(\d{4})-(\d{2}).*.pdf", filepath)
+    if match is None:
+        raise ValueError(f"cannot infer year-month from filepath: {filepath!r}")
+    s_year, s_month = match.groups()
+    return int(s_year), int(s_month.removeprefix("0"))
+
+
 def parse_mmdd(s: str, *, year: int, default_month: int) -> date:
     s = s.strip()
     if not s:
@@ -90,6 +126,14 @@ def parse_mmdd(s: str, *, year: int, default_month: int) -> date:
     raise ValueError(f"unexpected date format {s!r}")
 
 
+@functools.lru_cache(maxsize=1024)
+def _mmdd(m: str, d: str, year: int, default_month: int) -> date:
+    """:func:`parse_mmdd` for the digits already captured by ``TXN_LINE``."""
+    month = int(m)
+    y = year - 1 if month > default_month else year
+    return date(year=y, month=month, day=int(d))
+
+
 class CMBCreditPdfImporter(Importer):
     def __init__(
         self,
@@ -97,10 +141,16 @@ class CMBCreditPdfImporter(Importer):
         currency: str = "CNY",
         *,
         currency_map: dict[str, str] | None = None,
+        backend: str | PdfBackend = "pdfplumber",
+        line_cache: PdfLineCache | None = None,
+        workers: int | None = None,
     ) -> None:
         self._account: str = account
         self._currency: str = currency
         self._currency_map: dict[str, str] = currency_map or {"人民币元": "CNY"}
+        self._backend: PdfBackend = get_backend(backend)
+        self._line_cache: PdfLineCache | None = line_cache
+        self._workers: int | None = workers
 
     def account(self, filepath: str) -> data.Account:
         return self._account
@@ -118,17 +168,34 @@ class CMBCreditPdfImporter(Importer):
             self.cmp,
         )
 
-    def _is_non_txn_line(self, text: str) -> bool:
-        return any(pattern.match(text) for pattern in NON_TXN_PATTERNS)
+    def iter_lines(self, filepath: str) -> Iterator[str]:
+        """Yield the statement text lines, lazily and from the table region only.
+
+        Each page is cropped to the table: from its column header down to the
+        line ending it, the lines around never reach :meth:`parse_lines`.
+        """
+        return iter_lines(
+            filepath,
+            backend=self._backend,
+            table_header=TABLE_HEADER,
+            table_footer=TABLE_FOOTER,
+            cache=self._line_cache,
+            workers=self._workers,
+        )
 
-    def _parse_rows(
+    def parse_lines(
         self,
-        lines: list[str],
+        lines: Iterable[str],
         *,
         year: int,
         month: int,
-    ) -> list[Row]:
-        rows: list[Row] = []
+    ) -> Iterator[Row]:
+        """Parse the transaction table out of the statement text lines.
+
+        ``year`` and ``month`` are those of the statement, dates later in the
+        year than ``month`` belong to the previous year. Rows are yielded as
+        their lines are read.
+        """
         in_table = False
         current_section: str | None = None
 
@@ -137,7 +204,7 @@ class CMBCreditPdfImporter(Importer):
                 continue
 
             if not in_table:
-                if "交易日 记账日 交易摘要" in text:
+                if TABLE_HEADER in text:
                     in_table = True
                 continue
 
@@ -146,98 +213,129 @@ class CMBCreditPdfImporter(Importer):
                 or "Current Balance" in text
                 or "New Balance" in text
             ):
-                break
-
-            if text == "交易日 记账日 交易摘要 人民币金额 卡号末四位 交易地金额":
-                continue
-
-            if self._is_non_txn_line(text):
-                continue
-
-            if text in SECTION_MARKERS:
-                current_section = text
+                return
+
+            # most lines are transactions, the rest is only checked for the
+            # lines that are not
+            m = TXN_LINE.match(text)
+            if m is None:
+                if (
+                    text == "交易日 记账日 交易摘要 人民币金额 卡号末四位 交易地金额"
+                    or NON_TXN_LINE.match(text)
+                ):
+                    continue
+                if text in SECTION_MARKERS:
+                    current_section = text
+                    continue
+                yield self._parse_row_tokens(
+                    text, year=year, month=month, section=current_section
+                )
                 continue
 
-            tokens = text.split()
-            if not tokens or not DATE_TOKEN.match(tokens[0]):
-                raise ValueError(f"unexpected line in transaction table: {text!r}")
-
-            if len(tokens) < 5:
-                raise ValueError(f"too few tokens in transaction line: {text!r}")
-
-            trade_s = tokens[0]
-            idx = 1
-
-            if idx < len(tokens) and DATE_TOKEN.match(tokens[idx]):
-                book_s = tokens[idx]
-                idx += 1
-            else:
+            trade_s = text[:5]
+            if m["book"] is None:
                 book_s = trade_s
-
-            if len(tokens) - idx < 3:
-                raise ValueError(
-                    f"too few trailing tokens in transaction line: {text!r}"
-                )
-
-            amount_s = tokens[-3]
-            last4 = tokens[-2]
-            amount_in_location = tokens[-1]
-            summary_tokens = tokens[idx:-3]
-            summary = " ".join(summary_tokens).strip()
-
-            if not summary:
-                raise ValueError(f"empty summary in transaction line: {text!r}")
-            if not AMOUNT_TOKEN.match(amount_s):
-                raise ValueError(f"invalid amount in transaction line: {text!r}")
-            if not AMOUNT_TOKEN_WITH_CURRENCY.match(amount_in_location):
-                raise ValueError(
-                    f"invalid original amount in transaction line: {text!r}"
-                )
-            if not LAST4_TOKEN.match(last4):
-                raise ValueError(f"invalid card last4 in transaction line: {text!r}")
-
-            trade_date = parse_mmdd(trade_s, year=year, default_month=month)
-            booking_date = parse_mmdd(book_s, year=year, default_month=month)
-
-            rows.append(
-                Row(
-                    trade_date=trade_date,
-                    booking_date=booking_date,
-                    summary=summary,
-                    amount=amount_s,
-                    last_4=last4.strip(),
-                    amount_in_location=amount_in_location,
-                    section=current_section,
-                    trade_date_raw=trade_s,
-                    booking_date_raw=book_s,
-                    raw_line=text,
+                booking_date = trade_date = _mmdd(
+                    m["trade"], m["trade_day"], year, month
                 )
+            else:
+                book_s = text[6:11]
+                trade_date = _mmdd(m["trade"], m["trade_day"], year, month)
+                booking_date = _mmdd(m["book"], m["book_day"], year, month)
+
+            yield Row(
+                trade_date=trade_date,
+                booking_date=booking_date,
+                summary=m["summary"],
+                amount=m["amount"],
+                last_4=m["last4"],
+                amount_in_location=m["orig"],
+                section=current_section,
+                trade_date_raw=trade_s,
+                booking_date_raw=book_s,
+                raw_line=text,
             )
 
-        return rows
+    def _parse_row_tokens(
+        self,
+        text: str,
+        *,
+        year: int,
+        month: int,
+        section: str | None,
+    ) -> Row:
+        tokens = text.split()
+        if not tokens or not DATE_TOKEN.match(tokens[0]):
+            raise ValueError(f"unexpected line in transaction table: {text!r}")
+
+        if len(tokens) < 5:
+            raise ValueError(f"too few tokens in transaction line: {text!r}")
+
+        trade_s = tokens[0]
+        idx = 1
+
+        if idx < len(tokens) and DATE_TOKEN.match(tokens[idx]):
+            book_s = tokens[idx]
+            idx += 1
+        else:
+            book_s = trade_s
+
+        if len(tokens) - idx < 3:
+            raise ValueError(f"too few trailing tokens in transaction line: {text!r}")
+
+        amount_s = tokens[-3]
+        last4 = tokens[-2]
+        amount_in_location = tokens[-1]
+        summary_tokens = tokens[idx:-3]
+        summary = " ".join(summary_tokens).strip()
+
+        if not summary:
+            raise ValueError(f"empty summary in transaction line: {text!r}")
+        if not AMOUNT_TOKEN.match(amount_s):
+            raise ValueError(f"invalid amount in transaction line: {text!r}")
+        if not AMOUNT_TOKEN_WITH_CURRENCY.match(amount_in_location):
+            raise ValueError(f"invalid original amount in transaction line: {text!r}")
+        if not LAST4_TOKEN.match(last4):
+            raise ValueError(f"invalid card last4 in transaction line: {text!r}")
+
+        trade_date = parse_mmdd(trade_s, year=year, default_month=month)
+        booking_date = parse_mmdd(book_s, year=year, default_month=month)
+
+        return Row(
+            trade_date=trade_date,
+            booking_date=booking_date,
+            summary=summary,
+            amount=amount_s,
+            last_4=last4.strip(),
+            amount_in_location=amount_in_location,
+            section=section,
+            trade_date_raw=trade_s,
+            booking_date_raw=book_s,
+            raw_line=text,
+        )
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        match = re.search(r".*(\d{4})-(\d{2}).*.pdf", filepath)
-        if match is None:
-            raise ValueError(f"cannot infer year-month from filepath: {filepath!r}")
-        s_year, s_month = match.groups()
-        year = int(s_year)
-        month = int(s_month.removeprefix("0"))
+        return list(self.iter_extract(filepath))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per statement row, in statement order."""
+        year, month = statement_period(filepath)
+        rows = self.parse_lines(self.iter_lines(filepath), year=year, month=month)
+        yield from self.iter_entries(rows, filepath, year=year, month=month)
+
+    def build_entries(
+        self, rows: Iterable[Row], filepath: str, *, year: int, month: int
+    ) -> data.Entries:
+        """Turn parsed rows into transactions, ``filepath`` goes to the metadata."""
+        return list(self.iter_entries(rows, filepath, year=year, month=month))
+
+    def iter_entries(
+        self, rows: Iterable[Row], filepath: str, *, year: int, month: int
+    ) -> Iterator[data.Directive]:
+        """Like :meth:`build_entries`, one transaction at a time."""
         period_tag = f"credit-cmb-{year:04d}-{month:02d}"
 
-        results: list[data.Directive] = []
-
-        lines: list[str] = []
-        with pdfplumber.open(filepath) as pdf:
-            for page in pdf.pages:
-                for line in page.extract_text_lines():
-                    text = (line.get("text") or "").strip()
-                    if text:
-                        lines.append(text)
-
-        parsed_rows = self._parse_rows(lines, year=year, month=month)
-
-        for i, row in enumerate(parsed_rows):
+        for i, row in enumerate(rows):
             row_data = {
                 "trade_date": row.trade_date.isoformat(),
                 "booking_date": row.booking_date.isoformat(),
@@ -283,17 +381,13 @@ class CMBCreditPdfImporter(Importer):
                 tags = tags | frozenset({"installment"})
                 flag = "!"
 
-            results.append(
-                make_transaction(
-                    meta,
-                    trade_date_for_txn,
-                    flag,
-                    row.summary,
-                    None,
-                    tags,
-                    data.EMPTY_SET,
-                    postings,
-                )
+            yield make_transaction(
+                meta,
+                trade_date_for_txn,
+                flag,
+                row.summary,
+                None,
+                tags,
+                data.EMPTY_SET,
+                postings,
             )
-
-        return results
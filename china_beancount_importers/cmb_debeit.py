@@ -1,9 +1,10 @@
+import collections
 import csv
 import dataclasses
 import datetime
-import decimal
 import fnmatch
-import io
+import itertools
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Annotated
 
@@ -14,7 +15,10 @@ from beancount.core import data
 from beangulp import extract
 from beangulp.importer import Importer
 
-from .utils import make_posting, make_transaction
+from .amounts import parse_amount
+from .dates import parse_yyyymmdd
+from .memo import HeaderProbe, probe_header
+from .utils import make_posting, make_transaction, validate_rows
 
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
@@ -28,17 +32,61 @@ class Row:
     description: Annotated[str, pydantic.Field(alias="交易备注")]
 
 
-decoder = pydantic.TypeAdapter(Row)
+# validates a chunk of rows per call, see _decode_rows
+rows_decoder = pydantic.TypeAdapter(list[Row])
+_HEADER_LINES = 7
+_FOOTER_LINES = 3
+_CHUNK_ROWS = 1024
 _pattern = regex.compile(r"账\s+号: \[一卡通:\d{4}\*\*\*\*\*\*\*\*(\d{4})")
 
 
-def _parse_cmb_debit_last4_from_header(header_lines: list[str]) -> str:
+def _withhold_tail(lines: Iterable[str], n: int) -> Iterator[str]:
+    """Yield all but the last ``n`` lines, holding back only ``n`` at a time."""
+    window: collections.deque[str] = collections.deque()
+    for line in lines:
+        window.append(line)
+        if len(window) > n:
+            yield window.popleft()
+
+
+def _decode_rows(
+    records: Iterator[dict[str, str]],
+) -> Iterator[tuple[dict[str, str], Row]]:
+    """Strip and validate csv records, one validation call per chunk of rows."""
+    stripped = (
+        # DictReader fills the fields missing from short rows with None
+        {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in record.items()
+        }
+        for record in records
+    )
+    return validate_rows(rows_decoder, stripped, chunk_size=_CHUNK_ROWS)
+
+
+def _find_last4(header_lines: list[str]) -> str | None:
     for line in header_lines:
         m = _pattern.search(line)
         if m is not None:
             return m.group(1)
+    return None
 
-    header_preview = "".join(header_lines[:7])
+
+def _probe(filepath: str) -> HeaderProbe:
+    return probe_header(
+        filepath,
+        "cmb-debit",
+        lines=_HEADER_LINES,
+        encoding="utf-8-sig",
+        parse_suffix=_find_last4,
+    )
+
+
+def _parse_cmb_debit_last4_from_header(probe: HeaderProbe) -> str:
+    if probe.account_suffix is not None:
+        return probe.account_suffix
+
+    header_preview = "".join(probe.lines[:7])
     raise ValueError(
         f"cannot parse card last4 from CMB debit header: {header_preview!r}"
     )
@@ -67,10 +115,7 @@ class CMBDebitImporter(Importer):
         self._strip_wechat_prefix = strip_wechat_prefix
 
     def account(self, filepath: str) -> data.Account:
-        with open(filepath, encoding="utf-8-sig") as f:
-            header_lines = [next(f, "") for _ in range(7)]
-
-        last4 = _parse_cmb_debit_last4_from_header(header_lines)
+        last4 = _parse_cmb_debit_last4_from_header(_probe(filepath))
         return _resolve_account_from_last4(self._account_map, last4)
 
     def identify(self, filepath: str) -> bool:
@@ -87,74 +132,65 @@ class CMBDebitImporter(Importer):
         )
 
     def extract(self, filepath: str, existing: data.Entries) -> data.Entries:
-        with open(filepath, encoding="utf-8-sig") as f:
-            all_lines = f.readlines()
+        # the export is newest first
+        return list(reversed(list(self.iter_extract(filepath))))
 
-        header_lines = all_lines[:7]
-        lines = all_lines[7:-3]
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield directives in file order, newest row first.
 
-        last4 = _parse_cmb_debit_last4_from_header(header_lines)
+        The first row of each day is preceded by a ``Balance`` for the
+        following day. :meth:`extract` returns the reverse of this order.
+        """
+        probe = _probe(filepath)
+        last4 = _parse_cmb_debit_last4_from_header(probe)
         account = _resolve_account_from_last4(self._account_map, last4)
 
-        day_balance: dict[datetime.date, str] = {}
+        with open(filepath, encoding=probe.encoding) as f:
+            body = itertools.islice(f, _HEADER_LINES, None)
+            reader = csv.DictReader(_withhold_tail(body, _FOOTER_LINES))
 
-        results: list[data.Directive] = []
+            day_balance: dict[datetime.date, str] = {}
 
-        reader = csv.DictReader(io.StringIO("\n".join(lines)))
-
-        for i, record in enumerate(reader):
-            row_data = {key: value.strip() for key, value in record.items()}
-            row = decoder.validate_python(row_data)
-
-            meta = data.new_metadata(
-                filepath,
-                i,
-                kvlist={"time": row.time, "card_last4": last4, "row": row_data},
-            )
+            for i, (row_data, row) in enumerate(_decode_rows(reader)):
+                meta = data.new_metadata(
+                    filepath,
+                    i,
+                    kvlist={"time": row.time, "card_last4": last4, "row": row_data},
+                )
 
-            date = datetime.date(
-                year=int(row.date[:4]),
-                month=int(row.date[4:6]),
-                day=int(row.date[6:8]),
-            )
+                date = parse_yyyymmdd(row.date)
 
-            if row.income:
-                amount = decimal.Decimal(row.income)
-            else:
-                amount = -decimal.Decimal(row.outcome)
+                if row.income:
+                    amount = parse_amount(row.income)
+                else:
+                    amount = -parse_amount(row.outcome)
 
-            postings = [
-                make_posting(
-                    account=account,
-                    units=Amount(number=amount, currency=self._currency),
-                )
-            ]
+                postings = [
+                    make_posting(
+                        account=account,
+                        units=Amount(number=amount, currency=self._currency),
+                    )
+                ]
 
-            if date not in day_balance:
-                day_balance[date] = row.balance
-                results.append(
-                    data.Balance(
+                if date not in day_balance:
+                    day_balance[date] = row.balance
+                    yield data.Balance(
                         meta=data.new_metadata(filepath, i),
                         date=date + datetime.timedelta(days=1),
                         account=account,
-                        amount=Amount(decimal.Decimal(row.balance), "CNY"),
+                        amount=Amount(parse_amount(row.balance), "CNY"),
                         tolerance=None,
                         diff_amount=None,
                     )
-                )
 
-            description = row.description
-            if self._strip_wechat_prefix:
-                description = description.removeprefix("财付通-微信支付-")
-                description = description.removeprefix("财付通-")
+                description = row.description
+                if self._strip_wechat_prefix:
+                    description = description.removeprefix("财付通-微信支付-")
+                    description = description.removeprefix("财付通-")
 
-            results.append(
-                make_transaction(
+                yield make_transaction(
                     meta,
                     date,
                     narration=description,
                     postings=postings,
                 )
-            )
-
-        return list(reversed(results))
@@ -0,0 +1,90 @@
+"""Date and time parsing shared by the importers.
+
+Statements repeat the same few dates on thousands of rows, so dates are
+memoized, and the local time zone lookup behind ``datetime.astimezone`` is
+done once per hour of local time instead of once per row, except in hours
+with a time zone transition.
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_yyyymmdd(value: str) -> datetime.date:
+    """Parse ``'20240131'`` into a date."""
+    return datetime.date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """Parse ``'2023-08-30 20:46:41'`` into a naive datetime.
+
+    Accepts what ``strptime(value, "%Y-%m-%d %H:%M:%S")`` accepts.
+    """
+    if len(value) == 19 and value[10] == " ":
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    # fields without leading zeros, or a malformed value for strptime to report
+    return datetime.datetime.strptime(value, _DATETIME_FORMAT)
+
+
+@functools.lru_cache(maxsize=4096)
+def _hour_shift(
+    hour: str, tz: datetime.tzinfo | None
+) -> tuple[datetime.timedelta, datetime.tzinfo | None] | None:
+    """The offset of ``tz`` from local time, for ``'YYYY-MM-DD HH'`` local time.
+
+    None when the offset changes within the hour, or part of it does not
+    exist in local time, as in a DST gap.
+    """
+    start = datetime.datetime.fromisoformat(hour)
+    shifts: list[tuple[datetime.timedelta, datetime.tzinfo | None]] = []
+    for local in (start, start + datetime.timedelta(minutes=59, seconds=59)):
+        aware = local.astimezone()
+        if aware.replace(tzinfo=None) != local:
+            return None
+        converted = aware.astimezone(tz)
+        shifts.append((converted.replace(tzinfo=None) - local, converted.tzinfo))
+    return shifts[0] if shifts[0] == shifts[1] else None
+
+
+def parse_local_datetime(
+    value: str, tz: datetime.tzinfo | None = None
+) -> datetime.datetime:
+    """Parse a local time like :func:`parse_datetime` and convert it to ``tz``.
+
+    Same as ``strptime(value, ...).astimezone(tz)``, ``tz=None`` gives the
+    local time zone. The offset between local time and ``tz`` is looked up
+    once per hour of local time, or per value in hours holding a transition
+    or a gap. Changing the process time zone with ``time.tzset`` afterwards
+    is not noticed.
+    """
+    if len(value) == 19 and value[10] == " ":
+        try:
+            naive = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            hour_shift = _hour_shift(value[:13], tz)
+            if hour_shift is None:
+                return naive.astimezone(tz)
+            shift, tzinfo = hour_shift
+            if shift:
+                naive += shift
+            return datetime.datetime(
+                naive.year,
+                naive.month,
+                naive.day,
+                naive.hour,
+                naive.minute,
+                naive.second,
+                0,
+                tzinfo,
+            )
+    return parse_datetime(value).astimezone(tz)
@@ -0,0 +1,71 @@
+"""Encoding detection for the text statement exports.
+
+Banks have changed the encoding of their exports before. Instead of
+decoding a whole file with a fixed codec and failing at the end, the
+encoding is decided from the first few KiB and the file is then decoded
+incrementally as it is read.
+"""
+
+from __future__ import annotations
+
+import codecs
+from pathlib import Path
+from typing import TextIO
+
+SNIFF_BYTES = 8 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# tried in order for text without a BOM, utf-8 is strict enough that gb18030
+# text hardly ever passes for it
+_CANDIDATES = ("utf-8", "gb18030")
+
+
+def _decodes(head: bytes, encoding: str) -> bool:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        # not final, the head may end inside a character
+        decoder.decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def sniff_encoding(
+    filepath: str | Path, *, default: str, size: int = SNIFF_BYTES
+) -> str:
+    """Decide the encoding of a text file from its first ``size`` bytes.
+
+    A byte order mark wins. Plain ASCII gives ``default``, the encoding the
+    importer expects. Otherwise the first of utf-8 and gb18030 that decodes
+    the bytes is taken.
+
+    :raises ValueError: when none of them decodes the bytes
+    """
+    with open(filepath, "rb") as f:
+        head = f.read(size)
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if head.isascii():
+        return default
+
+    for encoding in _CANDIDATES:
+        if _decodes(head, encoding):
+            return encoding
+    raise ValueError(
+        f"cannot decode {str(filepath)!r} as any of {', '.join(_CANDIDATES)}"
+    )
+
+
+def open_text(filepath: str | Path, *, default: str) -> TextIO:
+    """Open a text file for reading in the encoding found by :func:`sniff_encoding`.
+
+    The file is decoded incrementally as it is read.
+    """
+    encoding = sniff_encoding(filepath, default=default)
+    return open(filepath, encoding=encoding)
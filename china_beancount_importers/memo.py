@@ -0,0 +1,148 @@
+"""Per-run memo of parsed statements.
+
+beangulp calls ``identify()``, ``account()`` and ``extract()`` on the same
+file separately, and each of them used to open and parse the statement on
+its own. What more than one of them reads, like the header lines of a
+statement, is loaded through :func:`memoized` instead, so it is read at most
+once per run as long as the file is not modified in between. What only
+``extract()`` reads is not memoized, it would only be kept in memory.
+
+Memoized values are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import itertools
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .encoding import open_text
+
+T = TypeVar("T")
+
+_Key = tuple[str, int, int, str]
+
+
+class DocumentMemo:
+    """LRU memo of parsed documents, bounded by the total size of its entries.
+
+    Entries are keyed by real path, mtime and size of the file plus a ``kind``
+    naming the representation (raw lines, first page, DataFrame...), so a
+    changed file is never served stale data.
+
+    :param max_bytes: upper bound of the summed entry sizes; entries larger
+        than this are returned but not kept
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes: int = max_bytes
+        self._entries: collections.OrderedDict[_Key, tuple[Any, int]] = (
+            collections.OrderedDict()
+        )
+        self._total: int = 0
+
+    def get(
+        self,
+        filepath: str | Path,
+        kind: str,
+        load: Callable[[], T],
+        *,
+        size: Callable[[T], int],
+    ) -> T:
+        """Return the memoized ``kind`` of ``filepath``, calling ``load`` on a miss.
+
+        ``size`` estimates the memory taken by the loaded value in bytes.
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            # let the loader raise a meaningful error
+            return load()
+
+        key: _Key = (os.path.realpath(filepath), st.st_mtime_ns, st.st_size, kind)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[0]  # type: ignore[no-any-return]
+
+        value = load()
+        nbytes = size(value)
+        if nbytes <= self.max_bytes:
+            self._entries[key] = (value, nbytes)
+            self._total += nbytes
+            self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._entries:
+            _key, (_value, nbytes) = self._entries.popitem(last=False)
+            self._total -= nbytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+default_memo = DocumentMemo()
+
+
+def memoized(
+    filepath: str | Path,
+    kind: str,
+    load: Callable[[], T],
+    *,
+    size: Callable[[T], int],
+) -> T:
+    """:meth:`DocumentMemo.get` on the process wide :data:`default_memo`."""
+    return default_memo.get(filepath, kind, load, size=size)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HeaderProbe:
+    """The leading lines of a statement and the account suffix found in them."""
+
+    path: Path
+    stat: os.stat_result
+    encoding: str
+    lines: tuple[str, ...]
+    account_suffix: str | None
+
+
+def probe_header(
+    filepath: str | Path,
+    kind: str,
+    *,
+    lines: int,
+    encoding: str,
+    parse_suffix: Callable[[list[str]], str | None],
+) -> HeaderProbe:
+    """Return the first ``lines`` lines of a text file, read at most once per run.
+
+    The file is decoded in the encoding found by
+    :func:`~.encoding.sniff_encoding`, ``encoding`` is the one expected for
+    plain ASCII. ``parse_suffix`` finds the account suffix in the header
+    lines. ``kind`` names the importer, probes of different importers are
+    kept apart.
+    """
+
+    def load() -> HeaderProbe:
+        path = Path(filepath)
+        with open_text(path, default=encoding) as f:
+            st = os.fstat(f.fileno())
+            head = list(itertools.islice(f, lines))
+            found = f.encoding
+        return HeaderProbe(path, st, found, tuple(head), parse_suffix(head))
+
+    return memoized(
+        filepath,
+        f"header:{kind}:{encoding}:{lines}",
+        load,
+        size=lambda probe: sum(map(len, probe.lines)),
+    )
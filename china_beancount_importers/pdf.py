@@ -0,0 +1,763 @@
+"""Shared PDF text extraction for the statement importers.
+
+All PDF importers consume the same thing: the stripped, non-empty text lines
+of every page, in page order. :func:`iter_lines` produces them lazily, a page
+is only laid out by pdfplumber when the parser asks for its first line, so
+parsers that stop at the end of the transaction table never pay for the
+trailing pages. Pages already laid out are shared for the rest of the run and
+can be cached on disk with :class:`PdfLineCache`.
+
+How a page is turned into lines is up to a :class:`PdfBackend`.
+:class:`PdfplumberBackend` (``"pdfplumber"``) is the reference,
+:class:`CharStreamBackend` (``"chars"``) produces the same lines from the raw
+character stream without pdfplumber's object and layout machinery.
+
+pdfplumber keeps the layout objects of every page alive until the document is
+closed. Each page is closed as soon as its lines are taken, so the peak memory
+of an extraction is that of laying out the largest single page plus the text
+lines collected so far, independent of the page count (checked by
+``tests/pdf_test.py::test_peak_memory_independent_of_page_count``).
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import json
+import os
+import re
+from collections.abc import Generator, Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+import pdfplumber
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar, LTContainer, LTItem
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfplumber.page import Page
+from pdfplumber.utils.text import DEFAULT_X_TOLERANCE, DEFAULT_Y_TOLERANCE, LIGATURES
+
+from .memo import memoized
+
+# Part of the cache key. Bump "format" whenever the lines this module derives
+# from a page change (the backends, _chars_to_lines, the table region), so
+# stale cache entries are never reused. The backend name is added to it.
+_EXTRACTION_PARAMS: dict[str, Any] = {
+    "format": 2,
+    "method": "extract_text_lines",
+    "strip": True,
+}
+
+
+def page_lines(page: Page) -> list[str]:
+    """Return the stripped, non-empty text lines of a single page."""
+    lines: list[str] = []
+    for line in page.extract_text_lines():
+        text = (line.get("text") or "").strip()
+        if text:
+            lines.append(text)
+    return lines
+
+
+class PdfBackend(abc.ABC):
+    """Turns a pdfplumber page into the text lines the parsers consume.
+
+    Subclasses must produce the stripped, non-empty lines of the page from top
+    to bottom, and set a unique ``name``, which is part of the cache key.
+
+    When ``table_header`` is given and found on the page, only the text fully
+    below the top of that header line is turned into lines. When one of
+    ``table_footer`` is found on a line below it, the text below the nearest
+    such line is left out as well, the footer line itself is kept so parsers
+    still see where the table ends. Pages without the header are not cropped. Page titles, summary boxes and
+    advertisements around the table never reach the parser. The characters
+    of the whole page are still read to find the header and footer, what is
+    saved is grouping the rest of them into lines.
+    """
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def lines(
+        self,
+        page: Page,
+        *,
+        table_header: str | None = None,
+        table_footer: Sequence[str] = (),
+    ) -> list[str]:
+        """Return the stripped, non-empty text lines of ``page``."""
+
+
+class PdfplumberBackend(PdfBackend):
+    """pdfplumber ``extract_text_lines()`` with default parameters."""
+
+    name = "pdfplumber"
+
+    def lines(
+        self,
+        page: Page,
+        *,
+        table_header: str | None = None,
+        table_footer: Sequence[str] = (),
+    ) -> list[str]:
+        if table_header is not None:
+            top, bottom = _find_region(
+                ((c["text"], c["top"], c["bottom"]) for c in page.chars),
+                table_header,
+                table_footer,
+            )
+            if top is not None:
+                page = page.within_bbox(_crop_bbox(page, top, bottom))
+        return page_lines(page)
+
+
+_REFERENCE_BACKEND = PdfplumberBackend()
+
+
+def _find_region(
+    chars: Iterable[tuple[str, float, float]],
+    header: str,
+    footers: Sequence[str],
+) -> tuple[float | None, float | None]:
+    """Find the table in a stream of ``(char, top, bottom)``.
+
+    Returns the top of the first char of ``header`` and the bottom of the
+    nearest of ``footers`` below it on the page, wherever the footer comes in
+    the stream. Both are None when the header is not on the page, the bottom
+    alone when no footer is below it. Whitespace is ignored on both sides,
+    the header columns may or may not be separated by blank chars.
+    """
+    haystack: list[str] = []
+    tops: list[float] = []
+    bottoms: list[float] = []
+    for char, char_top, char_bottom in chars:
+        if not char.isspace():
+            haystack.append(char)
+            tops.append(char_top)
+            bottoms.append(char_bottom)
+    text = "".join(haystack)
+
+    start = text.find("".join(header.split()))
+    if start < 0:
+        return None, None
+    top = tops[start]
+
+    bottom: float | None = None
+    for footer in footers:
+        needle = "".join(footer.split())
+        if not needle:
+            continue
+        index = text.find(needle)
+        while index >= 0:
+            # only a footer on a line below the header ends the table
+            if tops[index] > top:
+                end = max(bottoms[index : index + len(needle)])
+                bottom = end if bottom is None else min(bottom, end)
+            index = text.find(needle, index + 1)
+    return top, bottom
+
+
+def _crop_bbox(
+    page: Page, top: float | None, bottom: float | None
+) -> tuple[float, float, float, float]:
+    """The page bbox from just above ``top`` to just below ``bottom``.
+
+    The whole page is returned when the two would leave nothing between them.
+    """
+    x0, page_top, x1, page_bottom = page.bbox
+    if top is not None and bottom is not None and bottom <= top:
+        return x0, page_top, x1, page_bottom
+    crop_top, crop_bottom = page_top, page_bottom
+    if top is not None:
+        crop_top = max(page_top, top - DEFAULT_Y_TOLERANCE)
+    if bottom is not None:
+        crop_bottom = min(page_bottom, bottom + DEFAULT_Y_TOLERANCE)
+    if crop_bottom <= crop_top:
+        return x0, page_top, x1, page_bottom
+    return x0, crop_top, x1, crop_bottom
+
+
+class _CharCollector(PDFPageAggregator):
+    """pdfminer device keeping only the characters of a page."""
+
+    def paint_path(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def render_image(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class CharStreamBackend(PdfBackend):
+    """Group the raw pdfminer character stream into lines by position.
+
+    This mirrors what ``extract_text_lines()`` does with default parameters:
+    characters are clustered into lines by their top coordinate, split into
+    words at blanks and gaps wider than the x tolerance, and words are joined
+    with a single space. It runs the pdfminer interpreter directly, skips
+    paths and images, and never builds pdfplumber's per-object dicts or text
+    map, which roughly halves the extraction time of text-only statements.
+
+    Pages with rotated text are handed to :class:`PdfplumberBackend`.
+    """
+
+    name = "chars"
+
+    def lines(
+        self,
+        page: Page,
+        *,
+        table_header: str | None = None,
+        table_footer: Sequence[str] = (),
+    ) -> list[str]:
+        device = _CharCollector(page.pdf.rsrcmgr, pageno=page.page_number)
+        PDFPageInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+
+        mb_x0, mb_top = page.mediabox[:2]
+        chars: list[_Char] = []
+        for obj in _iter_chars(device.get_result()):
+            if not obj.upright:
+                return _REFERENCE_BACKEND.lines(
+                    page, table_header=table_header, table_footer=table_footer
+                )
+            chars.append(
+                (
+                    obj.get_text(),
+                    obj.x0 + mb_x0,
+                    obj.x1 + mb_x0,
+                    (page.height - obj.y1) + mb_top,
+                    (page.height - obj.y0) + mb_top,
+                )
+            )
+
+        if table_header is not None:
+            top, bottom = _find_region(
+                ((c[0], c[3], c[4]) for c in chars), table_header, table_footer
+            )
+            if top is not None:
+                # same selection as pdfplumber's within_bbox()
+                x0, top, x1, bottom = _crop_bbox(page, top, bottom)
+                chars = [
+                    c
+                    for c in chars
+                    if c[1] >= x0 and c[2] <= x1 and c[3] >= top and c[4] <= bottom
+                ]
+
+        return _chars_to_lines(chars)
+
+
+def _iter_chars(items: Iterable[LTItem]) -> Generator[LTChar, None, None]:
+    for item in items:
+        if isinstance(item, LTChar):
+            yield item
+        elif isinstance(item, LTContainer):
+            yield from _iter_chars(item)
+
+
+def _cluster(values: Iterable[float], tolerance: float) -> dict[float, int]:
+    """Map each value to its cluster, like pdfplumber's ``make_cluster_dict``."""
+    clusters: dict[float, int] = {}
+    index = -1
+    last = 0.0
+    for value in sorted(set(values)):
+        if index < 0 or value > last + tolerance:
+            index += 1
+        clusters[value] = index
+        last = value
+    return clusters
+
+
+# text, x0, x1, top, bottom
+_Char = tuple[str, float, float, float, float]
+
+
+def _chars_to_lines(chars: list[_Char]) -> list[str]:
+    # chars -> words as (top, text), in line then x order
+    line_of = _cluster((c[3] for c in chars), DEFAULT_Y_TOLERANCE)
+    words: list[tuple[float, str]] = []
+    for _, group in itertools.groupby(
+        sorted(chars, key=lambda c: line_of[c[3]]), key=lambda c: line_of[c[3]]
+    ):
+        word: list[_Char] = []
+        for char in sorted(group, key=lambda c: c[1]):
+            text, x0, _x1, top, _bottom = char
+            if text.isspace():
+                if word:
+                    words.append(_merge_word(word))
+                word = []
+                continue
+            if word:
+                prev = word[-1]
+                if (
+                    x0 < prev[1]
+                    or x0 > prev[2] + DEFAULT_X_TOLERANCE
+                    or abs(top - prev[3]) > DEFAULT_Y_TOLERANCE
+                ):
+                    words.append(_merge_word(word))
+                    word = []
+            word.append(char)
+        if word:
+            words.append(_merge_word(word))
+
+    lines: list[str] = []
+    word_line_of = _cluster((top for top, _ in words), DEFAULT_Y_TOLERANCE)
+    for _, line_words in itertools.groupby(words, key=lambda w: word_line_of[w[0]]):
+        text = " ".join(text for _, text in line_words).strip()
+        if text:
+            lines.append(text)
+    return lines
+
+
+def _merge_word(chars: list[_Char]) -> tuple[float, str]:
+    return (
+        min(c[3] for c in chars),
+        "".join(LIGATURES.get(c[0], c[0]) for c in chars),
+    )
+
+
+BACKENDS: dict[str, PdfBackend] = {
+    backend.name: backend for backend in (PdfplumberBackend(), CharStreamBackend())
+}
+
+
+def get_backend(backend: str | PdfBackend) -> PdfBackend:
+    if isinstance(backend, PdfBackend):
+        return backend
+    if backend not in BACKENDS:
+        known = ", ".join(sorted(BACKENDS))
+        raise ValueError(f"unknown PDF backend {backend!r}; known: {known}")
+    return BACKENDS[backend]
+
+
+_SNIFF_BYTES = 64 * 1024
+# pdfminer accepts junk before the header, like readers do within the first KiB
+_HEADER_SEARCH_BYTES = 1024
+
+
+@functools.cache
+def _needle_patterns(text: str) -> tuple[re.Pattern[bytes], ...]:
+    """Byte patterns for ``text`` as it may be stored in a PDF string object."""
+    utf16 = text.encode("utf-16-be")
+    # literal strings escape parentheses and backslashes
+    literal = b"".join(
+        (rb"\\?" if byte in b"()\\" else b"") + re.escape(bytes([byte]))
+        for byte in utf16
+    )
+    return (
+        re.compile(re.escape(text.encode("utf-8"))),
+        re.compile(literal),
+        re.compile(utf16.hex().encode(), re.IGNORECASE),
+    )
+
+
+def sniff_pdf(filepath: str | Path, text: str) -> bool | None:
+    """Look for ``text`` in the raw bytes of a PDF without parsing it.
+
+    Only the first and last 64 KiB are read, which hold the header, the
+    trailer and, for the statements we import, the document information
+    dictionary. Returns ``False`` when the file is not a PDF at all, i.e. has
+    no ``%PDF-`` header within its first KiB, ``True`` when ``text`` is found
+    as a UTF-8, UTF-16BE literal or hex string, and ``None`` when the bytes
+    are inconclusive and the pages have to be looked at.
+    """
+    with open(filepath, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+        if b"%PDF-" not in head[:_HEADER_SEARCH_BYTES]:
+            return False
+        size = f.seek(0, os.SEEK_END)
+        tail = b""
+        if size > len(head):
+            f.seek(max(len(head), size - _SNIFF_BYTES))
+            tail = f.read()
+
+    for pattern in _needle_patterns(text):
+        if pattern.search(head) or pattern.search(tail):
+            return True
+    return None
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "china-beancount-importers" / "pdf-lines"
+
+
+class PdfLineCache:
+    """On-disk cache of per-page text lines extracted from PDF files.
+
+    Entries are keyed by the sha256 of the file content, the pdfplumber
+    version and the extraction parameters, which carry the version of the
+    line format of this module. Renamed or re-downloaded statements still hit
+    the cache while a pdfplumber upgrade or a new line format invalidates it.
+
+    The cache directory is kept under ``max_bytes`` by evicting the least
+    recently used entries after each write.
+
+    :param directory: where to store entries, defaults to
+        ``$XDG_CACHE_HOME/china-beancount-importers/pdf-lines``
+    :param max_bytes: upper bound of the total size of cached entries
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str] | None = None,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.directory: Path = (
+            Path(directory).expanduser()
+            if directory is not None
+            else default_cache_dir()
+        )
+        self.max_bytes: int = max_bytes
+
+    def key(self, filepath: str | Path, params: dict[str, Any]) -> str:
+        h = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        h.update(pdfplumber.__version__.encode())
+        h.update(json.dumps(params, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> tuple[list[list[str]], int] | None:
+        """Return the cached pages and the total page count of the document.
+
+        Documents that were not read to the end have fewer cached pages than
+        their page count.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            pages: list[list[str]] = entry["pages"]
+            page_count: int = entry["page_count"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+        # refresh mtime, which is what eviction orders by
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return pages, page_count
+
+    def store(self, key: str, pages: list[list[str]], *, page_count: int) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"page_count": page_count, "pages": pages}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+
+class _Pages:
+    """Pages of one document laid out so far, shared through the memo."""
+
+    def __init__(self) -> None:
+        self.pages: list[list[str]] = []
+        self.page_count: int | None = None
+        self.cache_key: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        return self.page_count is not None and len(self.pages) == self.page_count
+
+
+def iter_pages(
+    filepath: str | Path,
+    *,
+    backend: str | PdfBackend = "pdfplumber",
+    table_header: str | None = None,
+    table_footer: Sequence[str] = (),
+    cache: PdfLineCache | None = None,
+    workers: int | None = None,
+) -> Generator[list[str], None, None]:
+    """Yield the text lines of each page, laying pages out on demand.
+
+    Pages are taken from the run-wide memo, then from ``cache``, and only the
+    remaining ones are laid out by ``backend``, one at a time as the consumer
+    advances. Closing the generator early leaves the later pages untouched;
+    the pages laid out so far are written back to ``cache``.
+
+    ``table_header`` and ``table_footer`` restrict each page to the table
+    region, see :class:`PdfBackend`.
+
+    With ``workers`` greater than 1 the whole document is laid out up front by
+    a pool of that many processes, each handling a contiguous page range.
+    The result is the same as a serial extraction.
+    """
+    backend = get_backend(backend)
+    table_footer = tuple(table_footer)
+    state = memoized(
+        filepath,
+        f"pdf-pages:{backend.name}:{table_header}:{table_footer}",
+        _Pages,
+        # the pages are laid out after the state is memoized, their text is
+        # a fraction of the size of the pdf
+        size=lambda _state: os.path.getsize(filepath),
+    )
+
+    if cache is not None and not state.complete:
+        if state.cache_key is None:
+            params = {
+                **_EXTRACTION_PARAMS,
+                "backend": backend.name,
+                "table_header": table_header,
+                "table_footer": table_footer,
+            }
+            state.cache_key = cache.key(filepath, params)
+        cached = cache.load(state.cache_key)
+        if cached is not None and len(cached[0]) > len(state.pages):
+            state.pages, state.page_count = cached
+
+    if workers is not None and workers > 1 and not state.complete:
+        state.pages = _extract_pages_parallel(
+            filepath, backend, table_header, table_footer, workers
+        )
+        state.page_count = len(state.pages)
+        _store(cache, state)
+
+    n = 0
+    while n < len(state.pages):
+        yield state.pages[n]
+        n += 1
+
+    if state.complete:
+        return
+
+    laid_out = len(state.pages)
+    try:
+        with pdfplumber.open(filepath) as pdf:
+            state.page_count = len(pdf.pages)
+            while n < state.page_count:
+                # another consumer of the same document may have got further
+                if n == len(state.pages):
+                    page = pdf.pages[n]
+                    state.pages.append(
+                        backend.lines(
+                            page, table_header=table_header, table_footer=table_footer
+                        )
+                    )
+                    # drop the layout objects before moving on to the next page
+                    page.close()
+                yield state.pages[n]
+                n += 1
+    finally:
+        if len(state.pages) > laid_out:
+            _store(cache, state)
+
+
+def _store(cache: PdfLineCache | None, state: _Pages) -> None:
+    if cache is None or state.cache_key is None or state.page_count is None:
+        return
+    cache.store(state.cache_key, state.pages, page_count=state.page_count)
+
+
+def iter_lines(
+    filepath: str | Path,
+    *,
+    backend: str | PdfBackend = "pdfplumber",
+    table_header: str | None = None,
+    table_footer: Sequence[str] = (),
+    cache: PdfLineCache | None = None,
+    workers: int | None = None,
+) -> Generator[str, None, None]:
+    """Yield the text lines of the whole document in page order, lazily."""
+    for lines in iter_pages(
+        filepath,
+        backend=backend,
+        table_header=table_header,
+        table_footer=table_footer,
+        cache=cache,
+        workers=workers,
+    ):
+        yield from lines
+
+
+def extract_pages(
+    filepath: str | Path,
+    *,
+    backend: str | PdfBackend = "pdfplumber",
+    table_header: str | None = None,
+    table_footer: Sequence[str] = (),
+    cache: PdfLineCache | None = None,
+    workers: int | None = None,
+) -> list[list[str]]:
+    """Return the text lines of every page."""
+    return list(
+        iter_pages(
+            filepath,
+            backend=backend,
+            table_header=table_header,
+            table_footer=table_footer,
+            cache=cache,
+            workers=workers,
+        )
+    )
+
+
+def extract_lines(
+    filepath: str | Path,
+    *,
+    backend: str | PdfBackend = "pdfplumber",
+    table_header: str | None = None,
+    table_footer: Sequence[str] = (),
+    cache: PdfLineCache | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    """Return the text lines of the whole document in page order."""
+    return list(
+        iter_lines(
+            filepath,
+            backend=backend,
+            table_header=table_header,
+            table_footer=table_footer,
+            cache=cache,
+            workers=workers,
+        )
+    )
+
+
+# A page break in a recorded lines file, extracted lines never contain it.
+_PAGE_BREAK = "\f"
+
+
+def dump_pages(filepath: str | Path, pages: Iterable[list[str]]) -> None:
+    """Record extracted pages to a UTF-8 text file, one line per text line.
+
+    Pages end with a form feed line. The file can be replayed with
+    :func:`load_pages` or :func:`load_lines` to run the importers' parse
+    stages without the PDF.
+    """
+    with open(filepath, "w", encoding="utf-8", newline="\n") as f:
+        for lines in pages:
+            f.writelines(f"{line}\n" for line in lines)
+            f.write(f"{_PAGE_BREAK}\n")
+
+
+def load_pages(filepath: str | Path) -> list[list[str]]:
+    """Replay the pages recorded with :func:`dump_pages`."""
+    pages: list[list[str]] = []
+    current: list[str] = []
+    with open(filepath, encoding="utf-8", newline="\n") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line == _PAGE_BREAK:
+                pages.append(current)
+                current = []
+            elif line:
+                current.append(line)
+    if current:
+        pages.append(current)
+    return pages
+
+
+def load_lines(filepath: str | Path) -> list[str]:
+    """Replay the text lines recorded with :func:`dump_pages`, in page order."""
+    return [line for lines in load_pages(filepath) for line in lines]
+
+
+def _extract_page_range(
+    filepath: str | Path,
+    backend: PdfBackend,
+    table_header: str | None,
+    table_footer: Sequence[str],
+    start: int,
+    stop: int,
+) -> list[list[str]]:
+    # pdfplumber page numbers are 1-based
+    pages: list[list[str]] = []
+    with pdfplumber.open(filepath, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            pages.append(
+                backend.lines(
+                    page, table_header=table_header, table_footer=table_footer
+                )
+            )
+            page.close()
+    return pages
+
+
+def _extract_pages_parallel(
+    filepath: str | Path,
+    backend: PdfBackend,
+    table_header: str | None,
+    table_footer: Sequence[str],
+    workers: int,
+) -> list[list[str]]:
+    with pdfplumber.open(filepath) as pdf:
+        page_count = len(pdf.pages)
+
+    workers = min(workers, page_count)
+    if workers <= 1:
+        return _extract_page_range(
+            filepath, backend, table_header, table_footer, 0, page_count
+        )
+
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _extract_page_range,
+            [filepath] * workers,
+            [backend] * workers,
+            [table_header] * workers,
+            [table_footer] * workers,
+            bounds[:-1],
+            bounds[1:],
+        )
+        # map() yields in submission order, which is page order
+        return [lines for chunk in chunks for lines in chunk]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Record the text lines of a PDF statement for replay."
+    )
+    parser.add_argument("pdf")
+    parser.add_argument("output")
+    parser.add_argument("--backend", default="pdfplumber", choices=sorted(BACKENDS))
+    parser.add_argument("--table-header")
+    parser.add_argument("--table-footer", action="append", default=[])
+    args = parser.parse_args(argv)
+
+    dump_pages(
+        args.output,
+        iter_pages(
+            args.pdf,
+            backend=args.backend,
+            table_header=args.table_header,
+            table_footer=args.table_footer,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
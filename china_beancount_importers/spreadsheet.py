@@ -0,0 +1,151 @@
+"""Row streaming reader for the xls/xlsx statement exports, built on calamine.
+
+Rows are read straight from the workbook with python-calamine and yielded one
+at a time as lists of cell texts, without building a DataFrame. Cells are
+converted to text the way ``pd.read_excel(..., dtype=str).fillna("")`` does,
+so importers can switch over without changing what they parse: empty cells
+become ``""``, whole numbers lose their ``.0`` and dates are written as
+``YYYY-MM-DD HH:MM:SS``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import sys
+from collections.abc import Generator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from python_calamine import CalamineWorkbook
+
+
+def cell_text(value: Any) -> str:
+    """Convert a calamine cell value to text, like pandas ``dtype=str``."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    if isinstance(value, datetime.datetime):
+        return str(value)
+    if isinstance(value, datetime.date):
+        return f"{value} 00:00:00"
+    return str(value)
+
+
+def iter_rows(
+    filepath: str | Path, *, sheet: int = 0
+) -> Generator[list[str], None, None]:
+    """Yield every row of a sheet as cell texts, starting at cell A1."""
+    workbook = CalamineWorkbook.from_path(str(filepath))
+    try:
+        data = workbook.get_sheet_by_index(sheet)
+        # calamine starts rows at the first used column, pandas at column A
+        pad = [""] * data.start[1] if data.start is not None else []
+        for row in data.iter_rows():
+            # most statement cells are text already
+            yield pad + [
+                value if type(value) is str else cell_text(value) for value in row
+            ]
+    finally:
+        workbook.close()
+
+
+def rows_size(rows: Sequence[Sequence[str]]) -> int:
+    """Estimate the memory taken by rows of cell texts, in bytes."""
+    return sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in rows)
+
+
+class Table(NamedTuple):
+    """A header row and the rows below it, cells by position."""
+
+    header: list[str]
+    rows: list[tuple[str, ...]]
+
+    def columns(self) -> dict[str, int]:
+        """Map column names to positions, the last one wins for duplicates."""
+        return {name: i for i, name in enumerate(self.header)}
+
+
+def _split_header(
+    rows: Iterator[list[str]], header_row: int | None, after: str | None
+) -> list[str] | None:
+    """Consume ``rows`` up to and including the header row and return it."""
+    if (header_row is None) == (after is None):
+        raise ValueError("exactly one of header_row and after is required")
+    if after is not None:
+        # only the first column is looked at
+        for row in rows:
+            if row and after in row[0]:
+                return next(rows, None)
+        return None
+    return next(itertools.islice(rows, header_row, None), None)
+
+
+def iter_table(
+    filepath: str | Path,
+    *,
+    header_row: int | None = None,
+    after: str | None = None,
+    sheet: int = 0,
+) -> Generator[list[str], None, None]:
+    """Yield the header row, then every row below it.
+
+    The header row is found as in :func:`iter_records`. Nothing is yielded
+    when it is not found.
+    """
+    rows = iter_rows(filepath, sheet=sheet)
+    try:
+        header = _split_header(rows, header_row, after)
+        if header is None:
+            return
+        yield header
+        yield from rows
+    finally:
+        rows.close()
+
+
+def read_table(
+    filepath: str | Path,
+    *,
+    header_row: int | None = None,
+    after: str | None = None,
+    sheet: int = 0,
+) -> Table:
+    """Read the header row and every row below it as tuples.
+
+    The header row is found as in :func:`iter_records`. An empty table is
+    returned when it is not found.
+    """
+    rows = iter_table(filepath, header_row=header_row, after=after, sheet=sheet)
+    header = next(rows, None)
+    if header is None:
+        return Table([], [])
+    return Table(header, list(map(tuple, rows)))
+
+
+def iter_records(
+    filepath: str | Path,
+    *,
+    header_row: int | None = None,
+    after: str | None = None,
+    columns: Sequence[str] | None = None,
+    sheet: int = 0,
+) -> Generator[dict[str, str], None, None]:
+    """Yield the rows below a header row as dicts keyed by column name.
+
+    The header row is either the row right after the first row whose first
+    cell contains ``after``, or the row at the 0-based index ``header_row``.
+    ``columns`` replaces the names found in the header row. Nothing is
+    yielded when the header row is not found.
+    """
+    rows = iter_rows(filepath, sheet=sheet)
+    try:
+        header = _split_header(rows, header_row, after)
+        if header is None:
+            return
+        keys = list(columns) if columns is not None else header
+        for row in rows:
+            yield dict(zip(keys, row, strict=True))
+    finally:
+        rows.close()
@@ -1,11 +1,19 @@
 import datetime
+import itertools
+from collections.abc import Iterable, Iterator
+from email import parser, policy
+from email.message import EmailMessage
+from pathlib import Path
 from typing import TypeVar
 
+import pydantic
 from beancount.core import data
 from beancount.core.amount import Amount
 from beancount.core.position import Cost, CostSpec
+from pydantic_core import InitErrorDetails
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 def cast_checked(t: type[T], val: object) -> T:
@@ -14,6 +22,50 @@ def cast_checked(t: type[T], val: object) -> T:
     return val
 
 
+def read_email(filepath: str | Path) -> EmailMessage:
+    """Parse an ``.eml`` file."""
+    with open(filepath, "rb") as f:
+        return parser.BytesParser(policy=policy.default).parse(fp=f)  # type: ignore[return-value]
+
+
+def validate_rows(
+    decoder: pydantic.TypeAdapter[list[T]],
+    records: Iterable[R],
+    *,
+    chunk_size: int,
+) -> Iterator[tuple[R, T]]:
+    """Validate records lazily, one ``decoder`` call per chunk of records.
+
+    Yields each record with its validated row. Errors are located by record
+    index in ``records``, not in the chunk.
+    """
+    it = iter(records)
+    start = 0
+    while chunk := list(itertools.islice(it, chunk_size)):
+        try:
+            rows = decoder.validate_python(chunk)
+        except pydantic.ValidationError as e:
+            raise _offset_errors(e, start) from None
+        yield from zip(chunk, rows, strict=True)
+        start += len(chunk)
+
+
+def _offset_errors(
+    error: pydantic.ValidationError, offset: int
+) -> pydantic.ValidationError:
+    """Shift the record index leading each error location by ``offset``."""
+    details: list[InitErrorDetails] = []
+    for e in error.errors():
+        index, *rest = e["loc"]
+        detail = InitErrorDetails(
+            type=e["type"], loc=(int(index) + offset, *rest), input=e["input"]
+        )
+        if "ctx" in e:
+            detail["ctx"] = e["ctx"]
+        details.append(detail)
+    return pydantic.ValidationError.from_exception_data(error.title, details)
+
+
 def make_posting(
     account: data.Account,
     units: Amount | None,
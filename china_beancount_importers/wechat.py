@@ -6,14 +6,17 @@ import csv
 import datetime
 import fnmatch
 import re
+from collections.abc import Iterator
 from pathlib import Path
 
-import pandas as pd
 from beancount.core import data, flags
 from beancount.core.amount import Amount
-from beancount.core.number import D
 from beangulp import Importer
 
+from .amounts import parse_amount
+from .dates import parse_local_datetime
+from .encoding import open_text
+from .spreadsheet import iter_table
 from .utils import make_posting, make_transaction
 
 _COMMENTS_STR = "收款方备注:二维码收款付款方留言:"
@@ -24,31 +27,33 @@ _TABLE_SEPARATOR = "------微信支付账单明细列表------"
 
 def parse_time(s: str) -> datetime.datetime:
     """parse date time from string '2023-08-30 20:46:41'"""
-    return datetime.datetime.strptime(s, "%Y-%m-%d %H:%M:%S").astimezone()
+    return parse_local_datetime(s)
 
 
-def _read_csv_rows(filepath: str) -> list[dict[str, str]]:
-    with open(filepath, encoding="utf-8") as f:
+def _iter_csv_rows(filepath: str) -> Iterator[list[str]]:
+    """Yield the header row of the table, then its rows in file order."""
+    with open_text(filepath, default="utf-8") as f:
         for line in f:
             if _TABLE_SEPARATOR in line:
-                return list(csv.DictReader(f))
-        return []
-
-
-def _read_xlsx_rows(filepath: str) -> list[dict[str, str]]:
-    df = pd.read_excel(filepath, dtype=str, header=None).fillna("")
-    header_idx = None
-    for i, row in enumerate(df.values):
-        if _TABLE_SEPARATOR in str(row[0]):
-            header_idx = i + 1
-            break
-    if header_idx is None:
-        return []
-    header: list[str] = df.values[header_idx]
-    rows: list[dict[str, str]] = []
-    for line in df.values[header_idx + 1 :]:
-        rows.append({key: value for key, value in zip(header, line, strict=True)})
-    return rows
+                break
+        else:
+            return
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        width = len(header)
+        for row in reader:
+            # blank lines are skipped and ragged rows are padded with "" or
+            # trimmed to the header, much like csv.DictReader does
+            if row:
+                yield row[:width] + [""] * (width - len(row))
+
+
+def _iter_xlsx_rows(filepath: str) -> Iterator[list[str]]:
+    """Yield the header row of the table, then its rows in file order."""
+    return iter_table(filepath, after=_TABLE_SEPARATOR)
 
 
 class WechatImporter(Importer):
@@ -80,18 +85,39 @@ class WechatImporter(Importer):
         filepath: str,
         existing: data.Entries | None = None,
     ) -> list[data.Directive]:
-        entries: list[data.Directive] = []
+        # the export is newest first
+        return list(reversed(list(self.iter_extract(filepath))))
+
+    def iter_extract(self, filepath: str) -> Iterator[data.Directive]:
+        """Yield one transaction per row in file order, newest row first.
+
+        :meth:`extract` returns the reverse of this order.
+        """
         suffix = Path(filepath).suffix.lower()
         if suffix in {".xlsx", ".xls"}:
-            rows = _read_xlsx_rows(filepath)
+            rows = _iter_xlsx_rows(filepath)
         else:
-            rows = _read_csv_rows(filepath)
-
-        for index, row in enumerate(reversed(rows)):
+            rows = _iter_csv_rows(filepath)
+
+        header = next(rows, None)
+        if header is None:
+            return
+
+        # the last one wins for duplicate column names
+        columns = {name: i for i, name in enumerate(header)}
+        i_time = columns["交易时间"]
+        i_method = columns["支付方式"]
+        i_amount = columns["金额(元)"]
+        i_direction = columns["收/支"]
+        i_payee = columns["交易对方"]
+        i_goods = columns["商品"]
+        i_status = columns["当前状态"]
+
+        for index, row in enumerate(rows):
             flag = flags.FLAG_WARNING
-            dt = parse_time(row["交易时间"])
-            account_1_text = row["支付方式"]
-            row_data = dict(row)
+            dt = parse_time(row[i_time])
+            account_1_text = row[i_method]
+            row_data = dict(zip(header, row, strict=True))
             meta = data.new_metadata(
                 filepath,
                 index,
@@ -101,11 +127,11 @@ class WechatImporter(Importer):
                     "row": row_data,
                 },
             )
-            amount = Amount(D(row["金额(元)"].lstrip("¥")), self.currency)
-            if row["收/支"] in {"支出", "/"}:
+            amount = Amount(parse_amount(row[i_amount]), self.currency)
+            if row[i_direction] in {"支出", "/"}:
                 amount = -amount
-            payee: str | None = row["交易对方"]
-            narration: str = row["商品"]
+            payee: str | None = row[i_payee]
+            narration: str = row[i_goods]
             if narration.startswith(_COMMENTS_STR):
                 narration = narration.replace(_COMMENTS_STR, "")
             if narration == "/":
@@ -115,7 +141,7 @@ class WechatImporter(Importer):
 
             postings = [make_posting(account_1, amount)]
 
-            if row["当前状态"] == "充值完成":
+            if row[i_status] == "充值完成":
                 postings.insert(
                     0,
                     make_posting(self._account, -amount),
@@ -132,5 +158,4 @@ class WechatImporter(Importer):
                 data.EMPTY_SET,
                 postings,
             )
-            entries.append(txn)
-        return entries
+            yield txn
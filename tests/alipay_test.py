@@ -0,0 +1,72 @@
+from decimal import Decimal
+from os import path
+
+from beancount.core import data
+
+from china_beancount_importers.alipay import AlipayImporter
+
+HEADER = "时间,资金渠道,支出,收入,商品说明,备注,名称,账户余额（元）"
+ROWS = [
+    '2023-08-30 20:46:41,余额,-12.50,,午饭,,,"1,087.50"',
+    '2023-08-30 21:00:00,余额,,100.00,,收款方备注:二维码收款付款方留言:转账,,"1,187.50"',
+]
+
+
+def _write_acclog(filepath, *, encoding="gb18030", newline="\r\n"):
+    lines = [
+        "支付宝账务明细查询",
+        "账号:[12345]",
+        "-------收支明细列表-----",
+        HEADER,
+        *ROWS,
+    ]
+    with open(filepath, "w", encoding=encoding, newline="") as f:
+        f.write(newline.join(lines) + newline)
+
+
+def test_extract(tmpdir):
+    p = path.join(tmpdir, "2088_ACCLOG.csv")
+    _write_acclog(p)
+
+    importer = AlipayImporter("Assets:Alipay")
+    entries = importer.extract(p, [])
+
+    assert [type(e) for e in entries] == [
+        data.Balance,
+        data.Transaction,
+        data.Transaction,
+    ]
+    assert entries[0].amount.number == Decimal("1087.50")
+    assert [e.postings[0].units.number for e in entries[1:]] == [
+        Decimal("-12.50"),
+        Decimal("100.00"),
+    ]
+    assert entries[2].payee == "转账"
+    assert entries[1].meta["row"]["商品说明"] == "午饭"
+
+
+def test_extract_utf8(tmpdir):
+    gb = path.join(tmpdir, "a_ACCLOG.csv")
+    utf8 = path.join(tmpdir, "b_ACCLOG.csv")
+    _write_acclog(gb)
+    _write_acclog(utf8, encoding="utf-8-sig", newline="\n")
+
+    importer = AlipayImporter("Assets:Alipay")
+    strip = [
+        e._replace(meta={**e.meta, "filename": ""}) for e in importer.extract(gb, [])
+    ]
+    assert [
+        e._replace(meta={**e.meta, "filename": ""}) for e in importer.extract(utf8, [])
+    ] == strip
+
+
+def test_empty_and_marker_missing(tmpdir):
+    empty = path.join(tmpdir, "a_ACCLOG.csv")
+    open(empty, "w").close()
+    missing = path.join(tmpdir, "b_ACCLOG.csv")
+    with open(missing, "w", encoding="gb18030") as f:
+        f.write(HEADER + "\n" + ROWS[0] + "\n")
+
+    importer = AlipayImporter("Assets:Alipay")
+    assert importer.extract(empty, []) == []
+    assert importer.extract(missing, []) == []
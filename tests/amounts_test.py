@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+import pytest
+
+from china_beancount_importers.amounts import parse_amount, parse_amounts
+from china_beancount_importers.ccb_credit_eml import parse_amount as eml_parse_amount
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("1,234.56", Decimal("1234.56")),
+        (" -10.00 ", Decimal("-10.00")),
+        ("(1,234.56)", Decimal("-1234.56")),
+        ("¥1.00", Decimal("1.00")),
+        ("￥\xa02,000.00", Decimal("2000.00")),
+        ("人民币元/32.50", Decimal("32.50")),
+        ("人民币 元/-123.45", Decimal("-123.45")),
+    ],
+)
+def test_parse_amount(raw, expected):
+    assert parse_amount(raw) == expected
+    assert parse_amounts([raw, raw]) == [expected, expected]
+
+
+def test_empty_amount():
+    assert parse_amount(" ", default=Decimal(0)) == Decimal(0)
+    assert parse_amounts(["", "1.00"], default=Decimal(0)) == [0, Decimal("1.00")]
+    with pytest.raises(ValueError, match="cannot parse amount"):
+        parse_amount("")
+
+
+def test_invalid_amount():
+    with pytest.raises(ValueError, match="cannot parse amount from 'abc'"):
+        parse_amounts(["1.00", "abc"])
+
+
+def test_separator_in_value():
+    with pytest.raises(ValueError):
+        parse_amounts(["1\0", "2"])
+
+
+def test_ccb_credit_eml_parse_amount_kept():
+    assert eml_parse_amount("(1,234.56)") == Decimal("-1234.56")
@@ -0,0 +1,65 @@
+import datetime
+from decimal import Decimal
+from email.message import EmailMessage
+from os import path
+
+import pytest
+
+from china_beancount_importers.ccb_credit_eml import CCBCreditEmlImporter
+
+
+def _row(trade, description, amount, currency="CNY"):
+    cells = (trade, trade, "1234", description, currency, amount, currency, amount)
+    return "<tr>" + "".join(f"<td>{text}</td>" for text in cells) + "</tr>"
+
+
+def write_ccb_eml(filepath, rows, *, period="2024年1月6日至2024年2月5日", footer=""):
+    html = (
+        "<html><body><table><tr><td>"
+        "<table><tr><td>Statement Date 2024-02-05</td></tr>"
+        f"<tr><td>账单周期 {period}</td></tr></table>"
+        "</td></tr><tr><td>"
+        "<table><tr><td colspan='8'>【交易明细】</td></tr>"
+        + "".join(_row(*row) for row in rows)
+        + "</table>"
+        f"</td></tr></table>{footer}</body></html>"
+    )
+    msg = EmailMessage()
+    msg["Subject"] = "中国建设银行信用卡电子账单"
+    msg.set_content(html, subtype="html")
+    with open(filepath, "wb") as f:
+        f.write(bytes(msg))
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_extract(tmpdir, parser):
+    p = path.join(tmpdir, "中国建设银行信用卡电子账单.eml")
+    write_ccb_eml(
+        p,
+        [("2024-01-10", "超市", "1,234.50"), ("2024-01-12", "退款", "-20.00", "")],
+    )
+
+    entries = CCBCreditEmlImporter("Liabilities:CCB", parser=parser).extract(p, [])
+
+    assert [(e.date, e.payee) for e in entries] == [
+        (datetime.date(2024, 1, 10), "超市"),
+        (datetime.date(2024, 1, 12), "退款"),
+    ]
+    assert [e.postings[0].units.number for e in entries] == [
+        Decimal("-1234.50"),
+        Decimal("20.00"),
+    ]
+    assert all(e.tags == {"credit-ccb-2024-01"} for e in entries)
+
+
+def test_period_below_detail_table_used_when_header_has_none(tmpdir):
+    p = path.join(tmpdir, "中国建设银行信用卡电子账单.eml")
+    write_ccb_eml(
+        p,
+        [("2024-01-10", "超市", "1.00")],
+        period="",
+        footer="<p>2024年3月6日至2024年4月5日</p>",
+    )
+
+    (entry,) = CCBCreditEmlImporter("Liabilities:CCB").extract(p, [])
+    assert entry.tags == {"credit-ccb-2024-03"}
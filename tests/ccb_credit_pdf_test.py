@@ -0,0 +1,44 @@
+from decimal import Decimal
+from os import path
+
+from china_beancount_importers.ccb_credit_pdf import CCBCreditPdfImporter
+from china_beancount_importers.pdf import load_lines
+
+
+def test_parse_recorded_lines():
+    importer = CCBCreditPdfImporter("Liabilities:CreditCard:CCB")
+    fixture = path.join(path.dirname(__file__), "fixtures", "pdf", "ccb_credit.txt")
+
+    records = importer.parse_lines(load_lines(fixture))
+    entries = importer.build_entries(records, fixture, year=2024, month=1)
+
+    assert [(e.date.isoformat(), e.payee) for e in entries] == [
+        ("2024-01-02", "支付宝-超市"),
+        ("2024-01-05", "还款"),
+    ]
+    assert [e.postings[0].units.number for e in entries] == [
+        Decimal("-45.60"),
+        Decimal("1000.00"),
+    ]
+    assert entries[0].meta["booking_date"] == "2024-01-03"
+    assert all("credit-ccb-2024-01" in e.tags for e in entries)
+
+
+def test_parse_legacy_lines():
+    importer = CCBCreditPdfImporter("Liabilities:CreditCard:CCB")
+    lines = [
+        "交易日 记账日 卡号后四位 交易币种/金额 结算币种/金额 交易描述",
+        "人民币账户",
+        "20240102 20240103 5678 CNY/45.60 CNY/45.60 支付宝-超市",
+        "20240104 20240104 5678 USD/1.00 CNY/7.10",
+        "APPLE.COM",
+    ]
+
+    records = list(importer.parse_lines(lines))
+
+    assert [
+        (r.description, r.trans_currency, r.settlement_amount) for r in records
+    ] == [
+        ("支付宝-超市", "CNY", Decimal("45.60")),
+        ("APPLE.COM", "USD", Decimal("7.10")),
+    ]
@@ -0,0 +1,90 @@
+from os import path
+
+import xlwt
+from beancount.core import data
+
+from china_beancount_importers.ccb_debeit import CCBDebeitImporter
+
+_HEADER = [
+    "序号",
+    "摘要",
+    "币别",
+    "钞汇",
+    "交易日期",
+    "交易金额",
+    "账户余额",
+    "交易地点/附言",
+    "对方账号与户名",
+]
+
+
+def _write_hqmx(filepath: str, rows: list[list[str]]) -> None:
+    wb = xlwt.Workbook(encoding="utf-8")
+    ws = wb.add_sheet("活期明细")
+    head = [["中国建设银行活期账户明细"], ["账号：6222"], [], _HEADER]
+    for r, row in enumerate(head + rows):
+        for c, value in enumerate(row):
+            ws.write(r, c, value)
+    wb.save(filepath)
+
+
+def test_extract(tmpdir):
+    p = path.join(tmpdir, "hqmx_3864.xls")
+    _write_hqmx(
+        p,
+        [
+            [
+                "1",
+                "消费",
+                "人民币",
+                "钞",
+                "20240103",
+                "-1,000.00",
+                "8,990.00",
+                "超市",
+                "",
+            ],
+            ["2", "消费", "人民币", "钞", "20240102", "-10.00", "9,990.00", "午餐", ""],
+            [
+                "3",
+                "转账",
+                "人民币",
+                "钞",
+                "20240102",
+                "5,000.00",
+                "10,000.00",
+                "工资",
+                "",
+            ],
+            ["4", "消费", "人民币", "钞", "20240101", "-3.50", "5,000.00", "咖啡", ""],
+        ],
+    )
+    importer = CCBDebeitImporter("Assets:Bank:CCB")
+    assert importer.identify(p)
+
+    entries = importer.extract(p, [])
+
+    summary = [
+        (
+            type(e).__name__,
+            e.date.isoformat(),
+            e.meta["lineno"],
+            (
+                e.amount.number
+                if isinstance(e, data.Balance)
+                else e.postings[0].units.number
+            ),
+        )
+        for e in entries
+    ]
+    assert summary == [
+        ("Balance", "2024-01-02", 3, 5000),
+        ("Transaction", "2024-01-01", 3, -3.5),
+        ("Transaction", "2024-01-02", 2, 5000),
+        ("Balance", "2024-01-03", 1, 9990),
+        ("Transaction", "2024-01-02", 1, -10),
+        ("Balance", "2024-01-04", 0, 8990),
+        ("Transaction", "2024-01-03", 0, -1000),
+    ]
+    assert entries[1].payee == "咖啡"
+    assert entries[1].meta["row"]["摘要"] == "消费"
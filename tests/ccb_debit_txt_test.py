@@ -1,6 +1,8 @@
 import csv
 from os import path
 
+import pydantic
+import pytest
 from beancount.core import data
 from beangulp.extract import extract_from_file
 
@@ -71,6 +73,17 @@ def test_identify(tmpdir):
     assert not other.identify(p)
 
 
+def test_undecodable_file(tmpdir):
+    p = path.join(tmpdir, "交易明细_3864.txt")
+    with open(p, "wb") as f:
+        # neither utf-8 nor gb18030
+        f.write(b"\x80\xff" * 16)
+    importer = CCBDebitTxtImporter(account_map={"3864": "Assets:Bank:CCB:3864"})
+
+    assert not importer.identify(p)
+    assert importer.account(p) == ""
+
+
 def test_extract(tmpdir):
     p = path.join(tmpdir, "交易明细_3864.txt")
     _write_ccb_debit_txt(p)
@@ -95,3 +108,34 @@ def test_extract(tmpdir):
     assert balance.account == "Assets:Bank:CCB:3864"
     assert balance.date.isoformat() == "2024-01-03"
     assert balance.amount.number == 120.0
+
+
+def test_invalid_row_reported_by_index(tmpdir):
+    p = path.join(tmpdir, "交易明细_3864.txt")
+    _write_ccb_debit_txt(p)
+    with open(p, "a", encoding="utf-8") as f:
+        f.write("20240104,20240104,14:00:00\n")  # truncated row
+    importer = CCBDebitTxtImporter(account_map={"3864": "Assets:Bank:CCB:3864"})
+
+    with pytest.raises(pydantic.ValidationError) as excinfo:
+        importer.extract(p, [])
+
+    assert {error["loc"][0] for error in excinfo.value.errors()} == {2}
+
+
+def test_rows_streamed_before_a_later_invalid_row(tmpdir):
+    p = path.join(tmpdir, "交易明细_3864.txt")
+    _write_ccb_debit_txt(p)
+    with open(p, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(p, "w", encoding="utf-8", newline="") as f:
+        f.writelines(lines[:4] + [lines[4]] * 1500 + ["20240104,20240104\n"])
+    importer = CCBDebitTxtImporter(account_map={"3864": "Assets:Bank:CCB:3864"})
+
+    directives = importer.iter_extract(p)
+    assert isinstance(next(directives), data.Transaction)
+
+    with pytest.raises(pydantic.ValidationError) as excinfo:
+        list(directives)
+
+    assert {error["loc"][0] for error in excinfo.value.errors()} == {1500}
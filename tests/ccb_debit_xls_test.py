@@ -3,6 +3,7 @@ from os import path
 import xlwt
 from beancount.core import data
 from beangulp.extract import extract_from_file
+from python_calamine import CalamineWorkbook
 
 from china_beancount_importers.ccb_debit_xls import CCBDebitXlsImporter
 
@@ -96,3 +97,23 @@ def test_extract(tmpdir):
     assert balance.account == "Assets:Bank:CCB:3864"
     assert balance.date.isoformat() == "2024-01-03"
     assert balance.amount.number == 120.0
+
+
+def test_workbook_read_once(tmpdir, monkeypatch):
+    p = path.join(tmpdir, "交易明细_3864.xls")
+    _write_ccb_debit_xls(p)
+    importer = CCBDebitXlsImporter(account="Assets:Bank:CCB:3864")
+
+    calls = []
+    from_path = CalamineWorkbook.from_path
+
+    def counting_from_path(*args, **kwargs):
+        calls.append(args)
+        return from_path(*args, **kwargs)
+
+    monkeypatch.setattr(CalamineWorkbook, "from_path", counting_from_path)
+
+    assert importer.identify(p)
+    assert importer.account(p) == "Assets:Bank:CCB:3864"
+    assert len(extract_from_file(importer, p, [])) == 3
+    assert len(calls) == 1
@@ -0,0 +1,98 @@
+import random
+from decimal import Decimal
+from os import path
+
+import pdfplumber
+import pytest
+
+from china_beancount_importers.ccb_xykmx_pdf import CCBXykmxPdfImporter
+from china_beancount_importers.pdf import load_lines
+from tests.utils import write_text_pdf
+
+
+def _random_lines(rng, n):
+    lines = ["第 1 页"]
+    for i in range(1, n + 1):
+        head = f"{i} 202401{rng.randint(1, 28):02d} 202401{rng.randint(1, 28):02d} 1234"
+        parts = rng.choice(
+            [
+                ["财付通-美团 人民币 元/-12.50"],
+                ["支付宝-一个很长的", "商户名称 续行", "人民币 元/1,234.00"],
+                ["消费  人民币", "元/ 3.00 其他"],
+                ["没有金额"],
+                ["人民币 元/5.00"],
+                ["A 人民币 元/1.00 B 人民币 元/2.00"],
+            ]
+        )
+        if rng.random() < 0.5:
+            lines.append(f"{head} {parts[0]}")
+            lines.extend(parts[1:])
+        else:
+            lines.append(f"{head} 摘要")
+            lines.extend(parts)
+    return lines
+
+
+def test_document_scan_matches_row_parser():
+    rng = random.Random(0)
+    lines = _random_lines(rng, 300)
+
+    expected = [
+        CCBXykmxPdfImporter._parse_row(row)
+        for row in CCBXykmxPdfImporter._stitch_rows(lines)
+    ]
+    records = CCBXykmxPdfImporter._scan_document(lines)
+
+    assert len(records) == 300
+    assert records == expected
+    assert records.count(None) > 0
+
+
+def test_identify_sniffs_title(tmpdir, monkeypatch):
+    importer = CCBXykmxPdfImporter("Liabilities:CreditCard:CCB")
+    title = ("\ufeff信用卡交易明细").encode("utf-16-be").decode("latin-1")
+    ours = path.join(tmpdir, "xykmx_1.pdf")
+    write_text_pdf(ours, [["page"]], info={"Title": title})
+    untitled = path.join(tmpdir, "xykmx_2.pdf")
+    write_text_pdf(untitled, [["page"]])
+    broken = path.join(tmpdir, "xykmx_3.pdf")
+    with open(broken, "wb") as f:
+        f.write(b"PK\x03\x04")
+
+    opened = []
+    pdfplumber_open = pdfplumber.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return pdfplumber_open(*args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, "open", counting_open)
+
+    assert importer.identify(ours)
+    assert not importer.identify(broken)
+    assert opened == []
+    # inconclusive, the first page is looked at
+    assert not importer.identify(untitled)
+    assert len(opened) == 1
+
+
+@pytest.mark.parametrize("document_scan", [False, True])
+def test_parse_recorded_lines(document_scan):
+    importer = CCBXykmxPdfImporter(
+        "Liabilities:CreditCard:CCB", document_scan=document_scan
+    )
+    fixture = path.join(path.dirname(__file__), "fixtures", "pdf", "ccb_xykmx.txt")
+
+    records = importer.parse_lines(load_lines(fixture))
+    entries = importer.build_entries(records, fixture)
+
+    assert [(e.meta["lineno"], e.narration) for e in entries] == [
+        (1, "财付通-一个很长的 商户名称"),
+        (2, "还款"),
+        (4, "超市"),
+    ]
+    assert [e.postings[0].units.number for e in entries] == [
+        Decimal("12.50"),
+        Decimal("-1000.00"),
+        Decimal("8.80"),
+    ]
@@ -0,0 +1,116 @@
+import datetime
+from decimal import Decimal
+from email.message import EmailMessage
+from os import path
+
+import pytest
+
+from china_beancount_importers.cmb_credit_eml import CmbEmlImporter
+
+
+def _band(trade, post, description, amount):
+    cells = "".join(
+        f"<td>{text}</td>" for text in ("", trade, post, description, amount)
+    )
+    return (
+        "<tr><td><div id='fixBand15'><table><tr><td>"
+        f"<table><tr>{cells}</tr></table>"
+        "</td></tr></table></div></td></tr>"
+    )
+
+
+def write_cmb_eml(
+    filepath,
+    bands,
+    *,
+    period="2024/01/01-2024/01/31",
+    before_period="",
+    before_transactions="",
+):
+    html = (
+        "<html><body>"
+        f"{before_period}"
+        f"<div id='fixBand2'><table><tr><td>账单周期 <span>{period}</span>"
+        "</td></tr></table></div>"
+        f"{before_transactions}"
+        "<div id='fixBand29'><div id='loopBand2'><table><tbody>"
+        + "".join(_band(*band) for band in bands)
+        + "<tr><td>没有明细</td></tr>"
+        "</tbody></table></div></div>"
+        "</body></html>"
+    )
+    msg = EmailMessage()
+    msg["Subject"] = "招商银行信用卡电子账单"
+    msg.set_content("plain")
+    msg.make_mixed()
+    msg.get_payload()[0].set_content(html, subtype="html")
+    with open(filepath, "wb") as f:
+        f.write(bytes(msg))
+
+
+def test_extract(tmpdir):
+    p = path.join(tmpdir, "招商银行信用卡电子账单.eml")
+    write_cmb_eml(
+        p,
+        [
+            ("0105", "0106", "星巴克-咖啡", "￥&nbsp;32.00"),
+            ("", "0110", "消费分期-第1期", "¥1,000.00"),
+        ],
+    )
+
+    entries = CmbEmlImporter("Liabilities:CMB").extract(p, [])
+
+    assert [e.date for e in entries] == [
+        datetime.date(2024, 1, 5),
+        datetime.date(2024, 1, 10),
+    ]
+    assert [(e.payee, e.narration) for e in entries] == [
+        ("星巴克", "咖啡"),
+        ("消费分期", "第1期"),
+    ]
+    assert [e.postings[0].units.number for e in entries] == [
+        Decimal("-32.00"),
+        Decimal("-1000.00"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "period", ["2024/01/01-2024/01/31", "2024/01/01&#45;2024/01/31"]
+)
+def test_period_found_in_text(tmpdir, period):
+    p = path.join(tmpdir, "招商银行信用卡电子账单.eml")
+    write_cmb_eml(p, [("1230", "1231", "a-b", "1.00")], period=period)
+
+    (entry,) = CmbEmlImporter("Liabilities:CMB").extract(p, [])
+    assert entry.date == datetime.date(2024, 12, 30)
+    assert entry.meta["row"]["transaction_date"] == "2024-01-31"
+
+
+def test_period_not_taken_from_markup(tmpdir):
+    p = path.join(tmpdir, "招商银行信用卡电子账单.eml")
+    write_cmb_eml(
+        p,
+        [("0105", "0106", "a-b", "1.00")],
+        before_period=(
+            "<!-- 2023/06/01-2023/06/30 -->" "<div title='2023/07/01-2023/07/31'></div>"
+        ),
+    )
+
+    (entry,) = CmbEmlImporter("Liabilities:CMB").extract(p, [])
+    assert entry.meta["row"]["transaction_date"] == "2024-01-31"
+
+
+def test_rows_outside_transaction_region_ignored(tmpdir):
+    p = path.join(tmpdir, "招商银行信用卡电子账单.eml")
+    write_cmb_eml(
+        p,
+        [("0105", "0106", "a-b", "1.00")],
+        before_transactions=(
+            "<div id='fixBand3'><div id='loopBand2'><table><tbody>"
+            + _band("0107", "0108", "c-d", "2.00")
+            + "</tbody></table></div></div>"
+        ),
+    )
+
+    entries = CmbEmlImporter("Liabilities:CMB").extract(p, [])
+    assert [e.payee for e in entries] == ["a"]
@@ -0,0 +1,107 @@
+import random
+from decimal import Decimal
+from os import path
+
+import pytest
+
+from china_beancount_importers.cmb_credit_pdf import CMBCreditPdfImporter
+from china_beancount_importers.pdf import load_lines
+
+HEADER = "交易日 记账日 交易摘要 人民币金额 卡号末四位 交易地金额"
+
+
+def _random_line(rng):
+    dates = [f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}"]
+    if rng.random() < 0.7:
+        dates.append(f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}")
+    summary = rng.sample(["财付通-美团", "支付宝", "01/05", "12.00", "A", "B C"], 2)
+    amount = rng.choice(["12.50", "-3.00", "(1,234.56)", "+8"])
+    orig = rng.choice(["12.50", "1.99(USD)", "(3.00)"])
+    sep = rng.choice([" ", " ", " ", "  "])
+    return sep.join([*dates, *summary, amount, "1234", orig])
+
+
+def test_parse_lines_matches_token_parser():
+    importer = CMBCreditPdfImporter("Liabilities:CreditCard:CMB")
+    rng = random.Random(0)
+    lines = [_random_line(rng) for _ in range(500)]
+
+    rows = list(
+        importer.parse_lines(
+            ["招商银行信用卡对账单", HEADER, "消费", *lines, "本期还款总额 1.00"],
+            year=2024,
+            month=1,
+        )
+    )
+
+    expected = [
+        importer._parse_row_tokens(line, year=2024, month=1, section="消费")
+        for line in lines
+    ]
+    assert rows == expected
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("Description RMB Amount x", None),
+        ("foo 01/02 A 1.00 1234 1.00", "unexpected line"),
+        ("01/02 A 1.00 1234", "too few tokens"),
+        ("01/02 01/03 1.00 1234 1.00", "empty summary"),
+        ("01/02 A x 1234 1.00", "invalid amount"),
+        ("01/02 A 1.00 1234 1.00(RMBXX)", "invalid original amount"),
+        ("01/02 A 1.00 12345 1.00", "invalid card last4"),
+        ("13/02 A 1.00 1234 1.00", "month must be in 1..12"),
+    ],
+)
+def test_parse_lines_errors(line, message):
+    importer = CMBCreditPdfImporter("Liabilities:CreditCard:CMB")
+    lines = [HEADER, line]
+    if message is None:
+        assert list(importer.parse_lines(lines, year=2024, month=1)) == []
+        return
+    with pytest.raises(ValueError, match=message):
+        list(importer.parse_lines(lines, year=2024, month=1))
+
+
+def test_parse_lines_skips_page_titles():
+    importer = CMBCreditPdfImporter("Liabilities:CreditCard:CMB")
+    # lines of two pages recorded without cropping to the table
+    lines = [
+        "招商银行信用卡对账单（个人消费卡账户 2024年01月）",
+        HEADER,
+        "01/02 01/03 A 1.00 1234 1.00",
+        "招商银行信用卡对账单（个人消费卡账户 2024年01月）",
+        "CMB Credit Card Statement (2024.01)",
+        "人民币账户 RMB A/C",
+        "本期账务明细 Transaction Details",
+        HEADER,
+        "01/04 01/05 B 2.00 1234 2.00",
+        "本期还款总额 3.00",
+    ]
+
+    rows = list(importer.parse_lines(lines, year=2024, month=1))
+
+    assert [row.summary for row in rows] == ["A", "B"]
+
+
+def test_parse_recorded_lines():
+    importer = CMBCreditPdfImporter("Liabilities:CreditCard:CMB")
+    fixture = path.join(path.dirname(__file__), "fixtures", "pdf", "cmb_credit.txt")
+
+    rows = importer.parse_lines(load_lines(fixture), year=2024, month=1)
+    entries = importer.build_entries(rows, fixture, year=2024, month=1)
+
+    assert [(e.date.isoformat(), e.payee, e.flag) for e in entries] == [
+        ("2023-12-28", "财付通-美团外卖", "*"),
+        ("2024-01-03", "APPLE.COM/BILL", "*"),
+        ("2024-01-05", "京东商城 分期 1/12", "!"),
+        ("2024-01-10", "自动还款", "*"),
+    ]
+    assert [e.postings[0].units.number for e in entries] == [
+        Decimal("-32.50"),
+        Decimal("-6.00"),
+        Decimal("-100.00"),
+        Decimal("500.00"),
+    ]
+    assert all("credit-cmb-2024-01" in e.tags for e in entries)
@@ -1,6 +1,8 @@
 import csv
 from os import path
 
+import pydantic
+import pytest
 from beancount.core import data
 from beangulp.extract import extract_from_file
 
@@ -48,3 +50,55 @@ def test_account_selected_from_header(tmpdir):
     assert balance.account == "Assets:Bank:CMB:1234"
     assert txn.postings[0].account == "Assets:Bank:CMB:1234"
     assert txn.meta.get("card_last4") == "1234"
+
+
+def test_iter_extract_yields_in_file_order(tmpdir):
+    csv_path = path.join(tmpdir, "CMB_foo.csv")
+    _write_cmb_debit_csv(csv_path)
+    importer = CMBDebitImporter(account_map={"1234": "Assets:Bank:CMB:1234"})
+
+    directives = importer.iter_extract(csv_path)
+    assert isinstance(next(directives), data.Balance)
+    assert isinstance(next(directives), data.Transaction)
+    assert next(directives, None) is None
+
+    assert importer.extract(csv_path, []) == list(
+        reversed(list(importer.iter_extract(csv_path)))
+    )
+
+
+def test_rows_streamed_across_chunks(tmpdir):
+    csv_path = path.join(tmpdir, "CMB_foo.csv")
+    _write_cmb_debit_csv(csv_path)
+    with open(csv_path, encoding="utf-8") as f:
+        lines = f.readlines()
+    # 2500 rows between the column header and the footer
+    row = lines[8]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.writelines(lines[:8] + [row] * 2500 + lines[-3:])
+
+    importer = CMBDebitImporter(account_map={"1234": "Assets:Bank:CMB:1234"})
+    directives = list(importer.iter_extract(csv_path))
+
+    txns = [entry for entry in directives if isinstance(entry, data.Transaction)]
+    assert len(txns) == 2500
+    assert [txn.meta["lineno"] for txn in txns] == list(range(2500))
+    assert sum(isinstance(entry, data.Balance) for entry in directives) == 1
+
+
+def test_invalid_row_reported_by_index_across_chunks(tmpdir):
+    csv_path = path.join(tmpdir, "CMB_foo.csv")
+    _write_cmb_debit_csv(csv_path)
+    with open(csv_path, encoding="utf-8") as f:
+        lines = f.readlines()
+    row = lines[8]
+    truncated = "20260225,20:00:00\n"
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.writelines(lines[:8] + [row] * 1500 + [truncated] + [row] + lines[-3:])
+
+    importer = CMBDebitImporter(account_map={"1234": "Assets:Bank:CMB:1234"})
+
+    with pytest.raises(pydantic.ValidationError) as excinfo:
+        list(importer.iter_extract(csv_path))
+
+    assert {error["loc"][0] for error in excinfo.value.errors()} == {1500}
@@ -0,0 +1,68 @@
+import datetime
+import time
+import zoneinfo
+
+import pytest
+
+from china_beancount_importers.dates import (
+    _hour_shift,
+    parse_datetime,
+    parse_local_datetime,
+    parse_yyyymmdd,
+)
+
+SHANGHAI = zoneinfo.ZoneInfo("Asia/Shanghai")
+
+
+def test_parse_yyyymmdd():
+    assert parse_yyyymmdd("20240131") == datetime.date(2024, 1, 31)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2023-08-30 20:46:41", "2023-8-3 1:02:03", "2023-03-12 02:30:00"],
+)
+@pytest.mark.parametrize("tz", [SHANGHAI, None])
+def test_parse_local_datetime_matches_strptime(value, tz):
+    expected = datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S").astimezone(tz)
+    parsed = parse_local_datetime(value, tz)
+    assert parsed == expected
+    assert parsed.tzinfo == expected.tzinfo
+    assert (parsed.date(), parsed.time()) == (expected.date(), expected.time())
+
+
+@pytest.mark.parametrize("value", ["2023-08-30T20:46:41", "2023-08-30 25:00:00", ""])
+def test_parse_datetime_rejects_what_strptime_rejects(value):
+    with pytest.raises(ValueError):
+        parse_datetime(value)
+    with pytest.raises(ValueError):
+        parse_local_datetime(value)
+
+
+@pytest.fixture
+def lord_howe(monkeypatch):
+    # DST starts with a half hour gap, 2023-10-01 02:00 to 02:30
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv("TZ", "Australia/Lord_Howe")
+    time.tzset()
+    _hour_shift.cache_clear()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+    _hour_shift.cache_clear()
+
+
+@pytest.mark.parametrize("day", ["2023-10-01", "2023-04-02"])
+@pytest.mark.parametrize("tz", [SHANGHAI, None])
+@pytest.mark.usefixtures("lord_howe")
+def test_parse_local_datetime_around_transitions(day, tz):
+    for hour in range(4):
+        for minute in range(0, 60, 5):
+            value = f"{day} {hour:02d}:{minute:02d}:00"
+            expected = datetime.datetime.strptime(
+                value, "%Y-%m-%d %H:%M:%S"
+            ).astimezone(tz)
+            parsed = parse_local_datetime(value, tz)
+            assert parsed == expected, value
+            assert parsed.utcoffset() == expected.utcoffset(), value
@@ -0,0 +1,47 @@
+import codecs
+from os import path
+
+import pytest
+
+from china_beancount_importers.encoding import open_text, sniff_encoding
+
+TEXT = "交易日期,交易时间\n20260225,20:00:00\n"
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (codecs.BOM_UTF8 + TEXT.encode(), "utf-8-sig"),
+        (codecs.BOM_UTF16_LE + TEXT.encode("utf-16-le"), "utf-16"),
+        (b"date,time\n", "gb18030"),
+        (TEXT.encode(), "utf-8"),
+        (TEXT.encode("gb18030"), "gb18030"),
+    ],
+)
+def test_sniff_encoding(tmpdir, data, expected):
+    p = path.join(tmpdir, "a.csv")
+    with open(p, "wb") as f:
+        f.write(data)
+
+    assert sniff_encoding(p, default="gb18030") == expected
+    with open_text(p, default="gb18030") as f:
+        assert f.read() in {TEXT, "date,time\n"}
+
+
+def test_head_may_end_inside_a_character(tmpdir):
+    p = path.join(tmpdir, "a.csv")
+    data = TEXT.encode()
+    with open(p, "wb") as f:
+        f.write(data)
+
+    # cut in the middle of the 3 byte "交"
+    assert sniff_encoding(p, default="gb18030", size=2) == "utf-8"
+
+
+def test_undecodable_fails_early(tmpdir):
+    p = path.join(tmpdir, "a.csv")
+    with open(p, "wb") as f:
+        f.write(b"\xff\xff\xff\xff" + b"x" * 1_000_000)
+
+    with pytest.raises(ValueError, match="cannot decode"):
+        sniff_encoding(p, default="utf-8")
@@ -0,0 +1,76 @@
+import os
+from os import path
+
+from china_beancount_importers.memo import DocumentMemo, probe_header
+
+
+def test_memo_reuses_until_file_changes(tmpdir):
+    p = path.join(tmpdir, "a.txt")
+    with open(p, "w") as f:
+        f.write("a")
+
+    memo = DocumentMemo()
+    calls = []
+
+    def load():
+        calls.append(1)
+        with open(p) as f:
+            return f.read()
+
+    assert memo.get(p, "text", load, size=len) == "a"
+    assert memo.get(p, "text", load, size=len) == "a"
+    assert len(calls) == 1
+
+    with open(p, "w") as f:
+        f.write("bb")
+    os.utime(p, ns=(0, 0))
+
+    assert memo.get(p, "text", load, size=len) == "bb"
+    assert len(calls) == 2
+
+
+def test_memo_evicts_least_recently_used(tmpdir):
+    memo = DocumentMemo(max_bytes=10)
+    files = []
+    for name in "abc":
+        p = path.join(tmpdir, name)
+        with open(p, "w") as f:
+            f.write("")
+        files.append(p)
+
+    a, b, c = files
+    memo.get(a, "v", lambda: "a", size=len)
+    memo.get(b, "v", lambda: "b" * 5, size=len)
+    memo.get(a, "v", lambda: "stale", size=len)  # touch a
+    memo.get(c, "v", lambda: "c" * 5, size=len)
+
+    assert len(memo) == 2
+    assert memo.get(a, "v", lambda: "reloaded", size=len) == "a"
+    assert memo.get(b, "v", lambda: "reloaded", size=len) == "reloaded"
+
+    # too large to keep at all
+    memo.get(c, "big", lambda: "x" * 11, size=len)
+    assert memo.get(c, "big", lambda: "y", size=len) == "y"
+
+
+def test_probe_header_reads_header_once(tmpdir):
+    p = path.join(tmpdir, "a.txt")
+    with open(p, "w", encoding="utf-8") as f:
+        f.write("账号：6222801234\nb\nc\n")
+    calls = []
+
+    def parse_suffix(lines):
+        calls.append(lines)
+        return lines[0].strip()[-4:]
+
+    probe = probe_header(
+        p, "test", lines=2, encoding="utf-8", parse_suffix=parse_suffix
+    )
+    assert probe.lines == ("账号：6222801234\n", "b\n")
+    assert probe.account_suffix == "1234"
+    assert probe.stat.st_size == os.stat(p).st_size
+    assert (
+        probe_header(p, "test", lines=2, encoding="utf-8", parse_suffix=parse_suffix)
+        is probe
+    )
+    assert len(calls) == 1
@@ -0,0 +1,346 @@
+import os
+import random
+import tracemalloc
+from os import path
+
+import pdfplumber
+import pytest
+
+from china_beancount_importers import pdf
+from china_beancount_importers.memo import default_memo
+from tests.utils import write_text_pdf
+
+
+def test_extract_lines(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["hello world", "  "], ["page two"]])
+
+    assert pdf.extract_pages(p) == [["hello world"], ["page two"]]
+    assert pdf.extract_lines(p) == ["hello world", "page two"]
+
+
+def test_cache_skips_pdfplumber(tmpdir, monkeypatch):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["hello world"], ["page two"]])
+    cache = pdf.PdfLineCache(path.join(tmpdir, "cache"))
+
+    assert pdf.extract_lines(p, cache=cache) == ["hello world", "page two"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pdfplumber should not be used on cache hit")
+
+    monkeypatch.setattr(pdfplumber, "open", fail)
+
+    # content addressed, a copy under another name hits the same entry
+    copy = path.join(tmpdir, "b.pdf")
+    with open(p, "rb") as src, open(copy, "wb") as dst:
+        dst.write(src.read())
+    assert pdf.extract_lines(copy, cache=cache) == ["hello world", "page two"]
+
+
+def test_cache_invalidated_by_line_format(tmpdir, monkeypatch):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["hello world"]])
+    cache = pdf.PdfLineCache(path.join(tmpdir, "cache"))
+    assert pdf.extract_lines(p, cache=cache) == ["hello world"]
+
+    params = pdf._EXTRACTION_PARAMS
+    monkeypatch.setattr(
+        pdf, "_EXTRACTION_PARAMS", {**params, "format": params["format"] + 1}
+    )
+    default_memo.clear()
+    assert pdf.extract_lines(p, cache=cache) == ["hello world"]
+    assert len(list(cache.directory.glob("*.json"))) == 2
+
+
+def test_cache_eviction(tmpdir):
+    cache = pdf.PdfLineCache(path.join(tmpdir, "cache"), max_bytes=120)
+
+    cache.store("old", [["x" * 20]], page_count=1)
+    os.utime(cache.directory / "old.json", (0, 0))
+    cache.store("new", [["y" * 20]], page_count=1)
+    assert sorted(p.name for p in cache.directory.iterdir()) == ["new.json", "old.json"]
+
+    cache.store("newer", [["z" * 20]], page_count=1)
+    assert cache.load("old") is None
+    assert cache.load("new") == ([["y" * 20]], 1)
+    assert cache.load("newer") == ([["z" * 20]], 1)
+
+
+def test_parallel_extraction_matches_serial(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [[f"page {i} line {j}" for j in range(3)] for i in range(7)])
+
+    serial = pdf.extract_pages(p)
+    for workers in (3, 20):
+        default_memo.clear()
+        assert pdf.extract_pages(p, workers=workers) == serial
+
+
+def _count_layouts(monkeypatch):
+    laid_out = []
+    page_lines = pdf.page_lines
+
+    def counting_page_lines(page):
+        laid_out.append(page.page_number)
+        return page_lines(page)
+
+    monkeypatch.setattr(pdf, "page_lines", counting_page_lines)
+    return laid_out
+
+
+def test_iter_lines_is_lazy(tmpdir, monkeypatch):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["first"], ["END"], ["terms"], ["ads"]])
+    laid_out = _count_layouts(monkeypatch)
+
+    for line in pdf.iter_lines(p):
+        if line == "END":
+            break
+    assert laid_out == [1, 2]
+
+    # later consumers reuse laid out pages and continue from there
+    assert pdf.extract_lines(p) == ["first", "END", "terms", "ads"]
+    assert laid_out == [1, 2, 3, 4]
+
+
+def test_cache_resumes_partial_document(tmpdir, monkeypatch):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["first"], ["second"], ["third"]])
+    cache = pdf.PdfLineCache(path.join(tmpdir, "cache"))
+    laid_out = _count_layouts(monkeypatch)
+
+    pages = pdf.iter_pages(p, cache=cache)
+    assert next(pages) == ["first"]
+    pages.close()
+    (entry,) = cache.directory.glob("*.json")
+    assert cache.load(entry.stem) == ([["first"]], 3)
+
+    # a fresh run: nothing memoized, the first page comes from the cache
+    default_memo.clear()
+    assert pdf.extract_lines(p, cache=cache) == ["first", "second", "third"]
+    assert laid_out == [1, 2, 3]
+
+
+def _peak_memory(filepath):
+    default_memo.clear()
+    tracemalloc.start()
+    try:
+        for _line in pdf.iter_lines(filepath):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        default_memo.clear()
+
+
+def test_peak_memory_independent_of_page_count(tmpdir):
+    page = [f"{i:04d} 2024-01-01 SOME MERCHANT NAME 123.45 CNY" for i in range(20)]
+    single = path.join(tmpdir, "single.pdf")
+    write_text_pdf(single, [page])
+    many = path.join(tmpdir, "many.pdf")
+    write_text_pdf(many, [page] * 10)
+
+    # laying out 10 pages at once would take ~10 times the memory of one
+    assert _peak_memory(many) < 2 * _peak_memory(single)
+
+
+def test_char_stream_backend_matches_pdfplumber(tmpdir):
+    rng = random.Random(0)
+    pages = []
+    for _ in range(3):
+        runs = []
+        for n in range(40):
+            # jitter within and beyond the y tolerance, random gaps and order
+            y = 800 - 13 * n + rng.choice([0, rng.uniform(-2.9, 2.9)])
+            x = rng.uniform(10, 400)
+            text = rng.choice(["ABC DEF", "x", "12.50  CNY", "(1,234.00)", " lead"])
+            runs.append((round(x, 2), round(y, 2), text))
+        rng.shuffle(runs)
+        pages.append(runs)
+
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, pages)
+
+    assert pdf.extract_pages(p, backend="chars") == pdf.extract_pages(p)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="unknown PDF backend"):
+        pdf.get_backend("nope")
+
+
+def test_backend_must_implement_lines():
+    class Incomplete(pdf.PdfBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_table_header_crops_page(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(
+        p,
+        [
+            [
+                "Statement 2024.01",
+                "Ads and rewards",
+                (40, 760, "Trans"),
+                (90, 760, "Post Description"),
+                (300, 761, "Amount"),
+                "01/02 01/03 COFFEE 12.00",
+            ],
+            ["no table on this page", "01/04 01/05 TEA 3.00"],
+        ],
+    )
+
+    expected = [
+        ["Trans Post Description Amount", "01/02 01/03 COFFEE 12.00"],
+        ["no table on this page", "01/04 01/05 TEA 3.00"],
+    ]
+    for backend in ("pdfplumber", "chars"):
+        pages = pdf.extract_pages(
+            p, backend=backend, table_header="Trans Post Description"
+        )
+        assert pages == expected
+
+
+def test_table_footer_crops_below_table(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(
+        p,
+        [
+            [
+                "Statement 2024.01",
+                "Trans Post Description Amount",
+                "01/02 01/03 COFFEE 12.00",
+                "Current Balance 12.00",
+                "Ads and rewards",
+            ],
+            ["01/04 01/05 TEA 3.00", "New Balance 3.00", "More ads"],
+        ],
+    )
+
+    expected = [
+        [
+            "Trans Post Description Amount",
+            "01/02 01/03 COFFEE 12.00",
+            "Current Balance 12.00",
+        ],
+        # no header on the page, nothing is cropped
+        ["01/04 01/05 TEA 3.00", "New Balance 3.00", "More ads"],
+    ]
+    for backend in ("pdfplumber", "chars"):
+        pages = pdf.extract_pages(
+            p,
+            backend=backend,
+            table_header="Trans Post Description",
+            table_footer=("New Balance", "Current Balance"),
+        )
+        assert pages == expected
+
+
+def test_table_footer_above_header_is_ignored(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(
+        p,
+        [
+            [
+                (40, 772, "Trans Post Description Amount"),
+                (40, 758, "01/02 01/03 COFFEE 12.00"),
+                (40, 744, "01/04 01/05 TEA 3.00"),
+                # a summary box above the table, written last
+                (40, 800, "New Balance 15.00"),
+            ],
+        ],
+    )
+
+    for backend in ("pdfplumber", "chars"):
+        pages = pdf.extract_pages(
+            p,
+            backend=backend,
+            table_header="Trans Post Description",
+            table_footer=("New Balance",),
+        )
+        assert pages == [
+            [
+                "Trans Post Description Amount",
+                "01/02 01/03 COFFEE 12.00",
+                "01/04 01/05 TEA 3.00",
+            ]
+        ]
+
+
+def test_table_footer_needs_header(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    page = ["New Balance 15.00", "01/02 01/03 COFFEE 12.00", "01/04 01/05 TEA 3.00"]
+    write_text_pdf(p, [page])
+
+    for backend in ("pdfplumber", "chars"):
+        pages = pdf.extract_pages(
+            p,
+            backend=backend,
+            table_header="Trans Post Description",
+            table_footer=("New Balance",),
+        )
+        assert pages == [page]
+
+
+def test_crop_bbox_never_empty(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["page"]])
+
+    with pdfplumber.open(p) as doc:
+        page = doc.pages[0]
+        assert pdf._crop_bbox(page, 500, 400) == page.bbox
+        assert pdf._crop_bbox(page, 500, 500) == page.bbox
+        assert pdf._crop_bbox(page, 100, 400) == (
+            0,
+            100 - pdf.DEFAULT_Y_TOLERANCE,
+            595,
+            400 + pdf.DEFAULT_Y_TOLERANCE,
+        )
+
+
+def test_sniff_pdf(tmpdir, monkeypatch):
+    title = "信用卡交易明细"
+    literal = path.join(tmpdir, "literal.pdf")
+    utf16 = ("\ufeff" + title).encode("utf-16-be").decode("latin-1")
+    write_text_pdf(literal, [["page"]], info={"Title": utf16})
+    other = path.join(tmpdir, "other.pdf")
+    write_text_pdf(other, [["page"]], info={"Title": "Statement"})
+    hexed = path.join(tmpdir, "hex.pdf")
+    with open(other, "rb") as f:
+        content = f.read()
+    with open(hexed, "wb") as f:
+        encoded = ("\ufeff" + title).encode("utf-16-be").hex().upper().encode()
+        f.write(content.replace(b"(Statement)", b"<" + encoded + b">"))
+    leading_junk = path.join(tmpdir, "junk.pdf")
+    with open(leading_junk, "wb") as f, open(literal, "rb") as src:
+        f.write(b"\r\n\x00junk" + src.read())
+    not_pdf = path.join(tmpdir, "not.pdf")
+    with open(not_pdf, "wb") as f:
+        f.write(b"<html></html>")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sniffing must not parse the PDF")
+
+    monkeypatch.setattr(pdfplumber, "open", fail)
+
+    assert pdf.sniff_pdf(literal, title) is True
+    assert pdf.sniff_pdf(hexed, title) is True
+    assert pdf.sniff_pdf(other, title) is None
+    assert pdf.sniff_pdf(leading_junk, title) is True
+    assert pdf.sniff_pdf(not_pdf, title) is False
+
+
+def test_dump_and_load_pages(tmpdir):
+    p = path.join(tmpdir, "a.pdf")
+    write_text_pdf(p, [["hello world", "second"], [], ["page three"]])
+    recorded = path.join(tmpdir, "a.txt")
+
+    pdf.main([p, recorded])
+
+    assert pdf.load_pages(recorded) == [["hello world", "second"], [], ["page three"]]
+    assert pdf.load_lines(recorded) == pdf.extract_lines(p)
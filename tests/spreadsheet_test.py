@@ -0,0 +1,117 @@
+import datetime
+from os import path
+
+import openpyxl
+import pandas as pd
+import pytest
+import xlwt
+
+from china_beancount_importers.spreadsheet import (
+    iter_records,
+    iter_rows,
+    iter_table,
+    read_table,
+)
+
+ROWS = [
+    [],
+    ["", "title"],
+    ["------separator------"],
+    ["name", "number", "amount", "flag"],
+    ["a", 1, 1.5, "x "],
+    ["b", 20240101.0, "", True],
+    [datetime.datetime(2024, 1, 2, 3, 4, 5), "", "", ""],
+]
+
+
+def _write_xls(filepath, rows=ROWS):
+    wb = xlwt.Workbook(encoding="utf-8")
+    ws = wb.add_sheet("sheet")
+    date_style = xlwt.easyxf(num_format_str="yyyy-mm-dd hh:mm:ss")
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            if isinstance(value, datetime.datetime):
+                ws.write(r, c, value, date_style)
+            else:
+                ws.write(r, c, value)
+    wb.save(filepath)
+
+
+def _write_xlsx(filepath, rows=ROWS):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row, start=1):
+            if value != "":
+                ws.cell(r, c, value)
+    wb.save(filepath)
+
+
+@pytest.mark.parametrize(
+    "suffix, write", [(".xls", _write_xls), (".xlsx", _write_xlsx)]
+)
+def test_rows_match_pandas(tmpdir, suffix, write):
+    p = path.join(tmpdir, "a" + suffix)
+    write(p)
+
+    expected = pd.read_excel(p, header=None, dtype=str).fillna("").values.tolist()
+    assert list(iter_rows(p)) == expected
+
+
+@pytest.mark.parametrize(
+    "suffix, write", [(".xls", _write_xls), (".xlsx", _write_xlsx)]
+)
+def test_rows_start_at_column_a(tmpdir, suffix, write):
+    p = path.join(tmpdir, "a" + suffix)
+    # column A is empty
+    write(p, [["", "t", ""], ["", "", "u"]])
+
+    expected = pd.read_excel(p, header=None, dtype=str).fillna("").values.tolist()
+    assert expected == [["", "t", ""], ["", "", "u"]]
+    assert list(iter_rows(p)) == expected
+
+
+def test_iter_records(tmpdir):
+    p = path.join(tmpdir, "a.xlsx")
+    _write_xlsx(p)
+
+    by_separator = list(iter_records(p, after="separator"))
+    assert by_separator[0] == {
+        "name": "a",
+        "number": "1",
+        "amount": "1.5",
+        "flag": "x ",
+    }
+    assert list(iter_records(p, header_row=3)) == by_separator
+    assert next(iter_records(p, header_row=3, columns="wxyz")) == {
+        "w": "a",
+        "x": "1",
+        "y": "1.5",
+        "z": "x ",
+    }
+    assert list(iter_records(p, after="missing")) == []
+
+
+def test_read_table(tmpdir):
+    p = path.join(tmpdir, "a.xls")
+    _write_xls(p)
+
+    table = read_table(p, after="separator")
+    assert table.header == ["name", "number", "amount", "flag"]
+    assert table.columns()["amount"] == 2
+    assert table.rows[:2] == [("a", "1", "1.5", "x "), ("b", "20240101", "", "True")]
+    assert [dict(zip(table.header, row)) for row in table.rows] == list(
+        iter_records(p, header_row=3)
+    )
+    assert read_table(p, after="missing") == ([], [])
+
+
+def test_iter_table(tmpdir):
+    p = path.join(tmpdir, "a.xls")
+    _write_xls(p)
+
+    rows = iter_table(p, after="separator")
+    table = read_table(p, after="separator")
+    assert next(rows) == table.header
+    assert list(map(tuple, rows)) == table.rows
+    assert list(iter_table(p, after="missing")) == []
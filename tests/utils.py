@@ -5,3 +5,69 @@ def get_importer(filepath):
     importer_list = runpy.run_path(filepath)
     assert len(importer_list["CONFIG"]) == 1, "config should contain only one importer"
     return importer_list["CONFIG"][0]
+
+
+def write_text_pdf(filepath, pages, *, info=None):
+    """Write a minimal PDF with one Helvetica text line per list item.
+
+    An item may also be an ``(x, y, text)`` tuple to place a text run at an
+    explicit position. Only ASCII text is supported, which is enough to
+    exercise the shared PDF helpers without shipping binary statement
+    fixtures.
+    """
+
+    def escape(s):
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf"]
+        for n, line in enumerate(lines):
+            x, y, text = line if isinstance(line, tuple) else (40, 800 - 14 * n, line)
+            ops.append(f"1 0 0 1 {x} {y} Tm ({escape(text)}) Tj")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    trailer_extra = b""
+    if info is not None:
+        entries = b" ".join(
+            b"/%s (%s)" % (k.encode(), escape(v).encode("latin-1"))
+            for k, v in info.items()
+        )
+        objects.append(b"<< %s >>" % entries)
+        trailer_extra = b" /Info %d 0 R" % len(objects)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        trailer_extra,
+        xref,
+    )
+
+    with open(filepath, "wb") as f:
+        f.write(out)
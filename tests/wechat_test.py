@@ -3,6 +3,7 @@ from decimal import Decimal
 from os import path
 from os.path import abspath, normpath
 
+import openpyxl
 from beancount.core.amount import Amount
 from beangulp.extract import extract_from_file
 
@@ -71,3 +72,105 @@ def test_extract(tmpdir):
         Amount(Decimal(-1), "CNY"),
     ]
     assert txn.postings[1].account == "Assets:WeChat"
+
+
+def test_extract_xlsx(tmpdir):
+    xlsx_path = path.join(tmpdir, "微信支付账单流水文件(20230801-20230831)_1.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for _ in range(16):
+        ws.append(["微信支付账单明细"])
+    ws.append(["------微信支付账单明细列表------"])
+    ws.append(
+        [
+            "交易时间",
+            "交易类型",
+            "交易对方",
+            "商品",
+            "收/支",
+            "金额(元)",
+            "支付方式",
+            "当前状态",
+            "交易单号",
+            "商户单号",
+            "备注",
+        ]
+    )
+    ws.append(
+        [
+            "2023-08-30 20:46:41",
+            "商户消费",
+            "某商户",
+            "午餐",
+            "支出",
+            "¥12.50",
+            "零钱",
+            "支付成功",
+            233,
+            "/",
+            "/",
+        ]
+    )
+    wb.save(xlsx_path)
+
+    importer: WechatImporter = get_importer("examples/wechat.import")
+    assert importer.identify(xlsx_path)
+    (txn,) = importer.extract(xlsx_path)
+    assert txn.payee == "某商户"
+    assert txn.narration == "午餐"
+    assert txn.meta["row"]["交易单号"] == "233"
+    assert txn.postings[0].units == Amount(Decimal("-12.50"), "CNY")
+
+
+def test_extract_ragged_rows(tmpdir):
+    csv_path = path.join(tmpdir, "微信支付账单(20200830-20200906).csv")
+    header = ["交易时间", "交易对方", "商品", "收/支", "金额(元)", "支付方式"]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.write("------微信支付账单明细列表------\n")
+        writer = csv.writer(f)
+        writer.writerow([*header, "当前状态", "备注"])
+        # no 当前状态 and 备注 fields
+        writer.writerow(
+            ["2023-08-30 20:46:41", "商户", "午饭", "支出", "¥10.00", "零钱"]
+        )
+        # a trailing comma adds an empty field
+        writer.writerow(
+            ["2023-08-31 08:00:00", "商户", "早饭", "支出", "¥5.00", "零钱"]
+            + ["支付成功", "/", ""]
+        )
+    importer: WechatImporter = get_importer("examples/wechat.import")
+    entries = importer.extract(csv_path)
+    assert [txn.narration for txn in entries] == ["早饭", "午饭"]
+    assert entries[1].meta["row"]["当前状态"] == ""
+    assert list(entries[0].meta["row"]) == [*header, "当前状态", "备注"]
+
+
+def test_iter_extract_yields_in_file_order(tmpdir):
+    csv_path = path.join(tmpdir, "微信支付账单(20200830-20200906).csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        f.write("------微信支付账单明细列表------\n")
+        writer = csv.writer(f)
+        writer.writerow(
+            ["交易时间", "交易对方", "商品", "收/支", "金额(元)"]
+            + ["支付方式", "当前状态"]
+        )
+        writer.writerow(
+            ["2023-08-31 08:00:00", "商户", "早饭", "支出", "¥5.00", "零钱", "支付成功"]
+        )
+        writer.writerow(
+            [
+                "2023-08-30 20:46:41",
+                "商户",
+                "午饭",
+                "支出",
+                "¥10.00",
+                "零钱",
+                "支付成功",
+            ]
+        )
+    importer: WechatImporter = get_importer("examples/wechat.import")
+
+    directives = importer.iter_extract(csv_path)
+    assert next(directives).narration == "早饭"
+    assert next(directives).narration == "午饭"
+    assert [txn.narration for txn in importer.extract(csv_path)] == ["午饭", "早饭"]